@@ -0,0 +1,80 @@
+"""transaction change log
+
+Revision ID: a2d6e8f1c3b9
+Revises: f3a9c2d7e5b1
+Create Date: 2026-10-17 19:12:48.605113
+
+transaction_changes records every insert, update and delete on
+transactions as (version, op, tx_id), written by statement-level triggers
+from their transition tables (one INSERT ... SELECT per statement, not one
+per row). A TRUNCATE is logged as a single 'T' row without an id, meaning
+"everything before this is gone, reload". app.db.changes_since() turns the
+log into the net changes after a version; app.db.compact_changes() trims it.
+
+Versions come from a sequence, taken while holding the row lock on
+data_versions('transactions') that the bump trigger also takes. Writers are
+thereby serialized until commit, so versions become visible in increasing
+order and a reader never skips a change that commits late.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d6e8f1c3b9'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c2d7e5b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LOG_CHANGES = """
+CREATE OR REPLACE FUNCTION log_transaction_changes() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM 1 FROM data_versions WHERE name = 'transactions' FOR UPDATE;
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO transaction_changes (op, tx_id) SELECT 'I', id FROM new_rows ORDER BY id;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO transaction_changes (op, tx_id) SELECT 'U', id FROM new_rows ORDER BY id;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO transaction_changes (op, tx_id) SELECT 'D', id FROM old_rows ORDER BY id;
+    ELSE
+        INSERT INTO transaction_changes (op) VALUES ('T');
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = {
+    "transactions_log_insert": "AFTER INSERT ON transactions REFERENCING NEW TABLE AS new_rows",
+    "transactions_log_update": "AFTER UPDATE ON transactions REFERENCING NEW TABLE AS new_rows",
+    "transactions_log_delete": "AFTER DELETE ON transactions REFERENCING OLD TABLE AS old_rows",
+    "transactions_log_truncate": "AFTER TRUNCATE ON transactions",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "transaction_changes",
+        sa.Column("version", sa.BigInteger, sa.Identity(), primary_key=True),
+        sa.Column("op", sa.CHAR(1), nullable=False),
+        sa.Column("tx_id", sa.Integer, nullable=True),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.CheckConstraint("op IN ('I','U','D','T')", name="ck_transaction_changes_op"),
+    )
+    op.create_index("ix_transaction_changes_tx_id_version", "transaction_changes", ["tx_id", "version"])
+    op.execute(LOG_CHANGES)
+    for name, when in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {when} FOR EACH STATEMENT EXECUTE FUNCTION log_transaction_changes()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON transactions")
+    op.execute("DROP FUNCTION log_transaction_changes()")
+    op.drop_table("transaction_changes")
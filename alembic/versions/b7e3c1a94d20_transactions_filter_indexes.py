@@ -0,0 +1,63 @@
+"""transactions filter indexes
+
+Revision ID: b7e3c1a94d20
+Revises: 10d48f683bb9
+Create Date: 2026-10-17 10:12:03.114512
+
+Composite indexes that match the access paths of get_transactions /
+get_transactions_page: every filter column leads an index that then
+continues in the (date desc, id desc) display order, so a filtered page is
+an index range scan with no sort. The single-column indexes created with
+the table are superseded (same leading column) and dropped.
+
+Notes substring search (ILIKE '%q%') gets a pg_trgm GIN index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c1a94d20'
+down_revision: Union[str, Sequence[str], None] = '10d48f683bb9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DISPLAY_ORDER = [sa.text("date DESC"), sa.text("id DESC")]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_transactions_date_id", "transactions", DISPLAY_ORDER)
+    op.create_index("ix_transactions_type_date_id", "transactions", ["type", *DISPLAY_ORDER])
+    op.create_index("ix_transactions_category_date_id", "transactions", ["category_id", *DISPLAY_ORDER])
+    op.create_index("ix_transactions_account_date_id", "transactions", ["account_id", *DISPLAY_ORDER])
+
+    op.drop_index("ix_transactions_date", table_name="transactions")
+    op.drop_index("ix_transactions_category", table_name="transactions")
+    op.drop_index("ix_transactions_account", table_name="transactions")
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_transactions_notes_trgm",
+        "transactions",
+        ["notes"],
+        postgresql_using="gin",
+        postgresql_ops={"notes": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_notes_trgm", table_name="transactions")
+
+    op.create_index("ix_transactions_date", "transactions", ["date"])
+    op.create_index("ix_transactions_category", "transactions", ["category_id"])
+    op.create_index("ix_transactions_account", "transactions", ["account_id"])
+
+    op.drop_index("ix_transactions_account_date_id", table_name="transactions")
+    op.drop_index("ix_transactions_category_date_id", table_name="transactions")
+    op.drop_index("ix_transactions_type_date_id", table_name="transactions")
+    op.drop_index("ix_transactions_date_id", table_name="transactions")
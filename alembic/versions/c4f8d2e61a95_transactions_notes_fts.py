@@ -0,0 +1,37 @@
+"""transactions notes full-text index
+
+Revision ID: c4f8d2e61a95
+Revises: b7e3c1a94d20
+Create Date: 2026-10-17 11:02:47.530219
+
+GIN expression index over the notes tsvector used by app.db.notes_match /
+search_transactions. The 'simple' configuration (no stemming, no stop
+words) keeps prefix search predictable for short free-form notes. The
+query side must use exactly this expression for the index to apply.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8d2e61a95'
+down_revision: Union[str, Sequence[str], None] = 'b7e3c1a94d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_transactions_notes_fts",
+        "transactions",
+        [sa.text("to_tsvector('simple'::regconfig, coalesce(notes, ''))")],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_notes_fts", table_name="transactions")
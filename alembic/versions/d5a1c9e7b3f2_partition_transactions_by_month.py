@@ -0,0 +1,182 @@
+"""partition transactions by month
+
+Revision ID: d5a1c9e7b3f2
+Revises: c4f8d2e61a95
+Create Date: 2026-10-17 14:21:09.402817
+
+Rebuilds `transactions` as a table range-partitioned by `date`, one
+partition per calendar month (transactions_pYYYY_MM) plus a DEFAULT
+partition so an insert never fails for lack of a partition. Date-bounded
+queries only touch the months they cover, and an old month can be
+detached (app.db.detach_partition) without rewriting anything.
+
+ensure_transaction_partitions(from, to) creates the monthly partitions
+for a date range ahead of time (finance-tracker-maintenance calls it from
+cron, the importer before inserting). It also gives any month that has landed in the DEFAULT
+partition its own partition, moving those rows across.
+
+The primary key becomes (id, date): a key on a partitioned table must
+include the partition column. ids still come from transactions_id_seq, so
+the ORM keeps using `id` alone. The upgrade copies every row, so it takes
+about as long as a bulk import of the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a1c9e7b3f2'
+down_revision: Union[str, Sequence[str], None] = 'c4f8d2e61a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = "id, date, amount, type, category_id, account_id, notes"
+DISPLAY_ORDER = [sa.text("date DESC"), sa.text("id DESC")]
+
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION ensure_transaction_partitions(
+    p_from date DEFAULT current_date,
+    p_to date DEFAULT (current_date + interval '3 months')::date
+) RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    m date;
+    part text;
+    created integer := 0;
+BEGIN
+    FOR m IN
+        SELECT month::date
+        FROM generate_series(date_trunc('month', p_from), date_trunc('month', p_to),
+                             interval '1 month') AS month
+        UNION
+        SELECT DISTINCT date_trunc('month', date)::date FROM transactions_default
+        ORDER BY 1
+    LOOP
+        part := format('transactions_p%s', to_char(m, 'YYYY_MM'));
+        CONTINUE WHEN to_regclass(part) IS NOT NULL;
+
+        -- the new range must not overlap rows still sitting in the default
+        -- partition, so move them into the new table before attaching it
+        EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM transactions_default WHERE date >= %L AND date < %L RETURNING *) '
+            'INSERT INTO %I SELECT * FROM moved',
+            m, (m + interval '1 month')::date, part);
+        EXECUTE format('ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                       part, m, (m + interval '1 month')::date);
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END
+$$
+"""
+
+
+def create_indexes() -> None:
+    op.create_index("ix_transactions_date_id", "transactions", DISPLAY_ORDER)
+    op.create_index("ix_transactions_type_date_id", "transactions", ["type", *DISPLAY_ORDER])
+    op.create_index("ix_transactions_category_date_id", "transactions", ["category_id", *DISPLAY_ORDER])
+    op.create_index("ix_transactions_account_date_id", "transactions", ["account_id", *DISPLAY_ORDER])
+    op.create_index(
+        "ix_transactions_notes_trgm",
+        "transactions",
+        ["notes"],
+        postgresql_using="gin",
+        postgresql_ops={"notes": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_transactions_notes_fts",
+        "transactions",
+        [sa.text("to_tsvector('simple'::regconfig, coalesce(notes, ''))")],
+        postgresql_using="gin",
+    )
+
+
+def create_constraints(table: str) -> None:
+    op.create_check_constraint("ck_transactions_type", table, "type IN ('income','expense')")
+    op.create_check_constraint("ck_transactions_amount_positive", table, "amount >= 0")
+    op.create_foreign_key(
+        "transactions_category_id_fkey", table, "categories", ["category_id"], ["id"], ondelete="RESTRICT"
+    )
+    op.create_foreign_key(
+        "transactions_account_id_fkey", table, "accounts", ["account_id"], ["id"], ondelete="RESTRICT"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table("transactions", "transactions_unpartitioned")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_unpartitioned_pkey")
+    for name in ("ix_transactions_date_id", "ix_transactions_type_date_id", "ix_transactions_category_date_id",
+                 "ix_transactions_account_date_id", "ix_transactions_notes_trgm", "ix_transactions_notes_fts"):
+        op.drop_index(name, table_name="transactions_unpartitioned")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE transactions (
+            id integer NOT NULL DEFAULT nextval('transactions_id_seq'),
+            date date NOT NULL,
+            amount numeric(12, 2) NOT NULL,
+            type varchar(10) NOT NULL,
+            category_id integer NOT NULL,
+            account_id integer NOT NULL,
+            notes varchar(255),
+            CONSTRAINT transactions_pkey PRIMARY KEY (id, date)
+        ) PARTITION BY RANGE (date)
+        """
+    )
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    create_constraints("transactions")
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+    op.execute(ENSURE_PARTITIONS)
+
+    # partitions for the existing rows (and the next months), then copy them
+    # in before the indexes exist, which is much faster than maintaining them
+    op.execute(
+        """
+        SELECT ensure_transaction_partitions(min(date), max(date))
+        FROM transactions_unpartitioned HAVING count(*) > 0
+        """
+    )
+    op.execute("SELECT ensure_transaction_partitions()")
+    op.execute(
+        f"INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_unpartitioned"
+    )
+    op.drop_table("transactions_unpartitioned")
+
+    create_indexes()
+    op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        CREATE TABLE transactions_unpartitioned (
+            id integer NOT NULL DEFAULT nextval('transactions_id_seq'),
+            date date NOT NULL,
+            amount numeric(12, 2) NOT NULL,
+            type varchar(10) NOT NULL,
+            category_id integer NOT NULL,
+            account_id integer NOT NULL,
+            notes varchar(255)
+        )
+        """
+    )
+    op.execute(
+        f"INSERT INTO transactions_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM transactions"
+    )
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY NONE")
+    op.execute("DROP FUNCTION ensure_transaction_partitions(date, date)")
+    # drops the attached partitions too; detached ones are left alone
+    op.drop_table("transactions")
+
+    op.rename_table("transactions_unpartitioned", "transactions")
+    op.create_primary_key("transactions_pkey", "transactions", ["id"])
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    create_constraints("transactions")
+    create_indexes()
@@ -0,0 +1,50 @@
+"""account balance checkpoints
+
+Revision ID: e8b2f4a6c1d7
+Revises: d5a1c9e7b3f2
+Create Date: 2026-10-17 16:40:12.918305
+
+Closing balance of every account at the end of each month in which it has
+transactions, so app.balances can answer "balance of account X on day D"
+from one checkpoint plus that month's rows. Filled from the existing
+transactions here; kept current by app.balances afterwards.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2f4a6c1d7'
+down_revision: Union[str, Sequence[str], None] = 'd5a1c9e7b3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "account_balance_checkpoints",
+        sa.Column("account_id", sa.Integer, sa.ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("month", sa.Date, primary_key=True),
+        sa.Column("balance", sa.Numeric(14, 2), nullable=False),
+    )
+    op.execute(
+        """
+        INSERT INTO account_balance_checkpoints (account_id, month, balance)
+        SELECT account_id, month, sum(delta) OVER (PARTITION BY account_id ORDER BY month)
+        FROM (
+            SELECT account_id,
+                   date_trunc('month', date)::date AS month,
+                   sum(CASE WHEN type = 'income' THEN amount ELSE -amount END) AS delta
+            FROM transactions
+            GROUP BY 1, 2
+        ) AS monthly
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("account_balance_checkpoints")
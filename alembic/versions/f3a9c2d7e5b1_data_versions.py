@@ -0,0 +1,68 @@
+"""data version counters
+
+Revision ID: f3a9c2d7e5b1
+Revises: e8b2f4a6c1d7
+Create Date: 2026-10-17 18:05:33.140926
+
+One counter per table the dashboards read (transactions, accounts,
+categories), bumped by a statement-level trigger after every INSERT,
+UPDATE, DELETE or TRUNCATE. Reading the three counters is a cheap way to
+tell whether anything changed since a result was computed, which is what
+app.db.data_version() hands to the result caches.
+
+Statement triggers on the partitioned transactions table fire for
+statements against the parent only. Rows moved between partitions by
+ensure_transaction_partitions() do not bump it (nothing visible changes);
+app.db.detach_partition() bumps it explicitly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c2d7e5b1'
+down_revision: Union[str, Sequence[str], None] = 'e8b2f4a6c1d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ("transactions", "accounts", "categories")
+
+BUMP_DATA_VERSION = """
+CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = TG_TABLE_NAME;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "data_versions",
+        sa.Column("name", sa.String(63), primary_key=True),
+        sa.Column("version", sa.BigInteger, nullable=False, server_default="0"),
+    )
+    op.execute(BUMP_DATA_VERSION)
+    for table in TABLES:
+        op.execute(f"INSERT INTO data_versions (name) VALUES ('{table}')")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_bump_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_version ON {table}")
+    op.execute("DROP FUNCTION bump_data_version()")
+    op.drop_table("data_versions")
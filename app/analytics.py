@@ -0,0 +1,226 @@
+# app/analytics.py
+"""
+Time-series analytics for the dashboard.
+
+The transactions of a date window are fetched in one bulk COPY (a plain
+query on the SQLite replica) as compact integer columns (day number, cents,
+income flag, category id) into a DataFrame. Everything else is vectorized
+NumPy over those arrays: monthly and weekly income/expense/net series,
+rolling averages and per-category monthly expense with a linear trend.
+"""
+import io
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import BigInteger, Integer, and_, case, cast, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+
+from .db import transaction_filters
+from .models import Transaction
+
+EPOCH = date(1970, 1, 1)
+ROLLING_MONTHS = 3
+TREND_MONTHS = 12
+
+
+class Analytics(NamedTuple):
+    monthly: pd.DataFrame           # income / expense / net per month (index: month start)
+    weekly: pd.DataFrame            # the same per ISO week (index: Monday)
+    monthly_rolling: pd.DataFrame   # rolling mean of `monthly` over ROLLING_MONTHS
+    category_monthly: pd.DataFrame  # expense per month (rows) and category (columns)
+    category_trends: pd.DataFrame   # per category: total, monthly_mean, slope, last
+
+
+# ---------- loading ----------
+class days_since_epoch(GenericFunction):
+    """Whole days from 1970-01-01 to a date column."""
+    name = "days_since_epoch"
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(days_since_epoch)
+def _days_since_epoch(element, compiler, **kw):
+    # SQLite keeps dates as ISO strings; 2440587.5 is the Julian day of 1970-01-01
+    return f"CAST(julianday({compiler.process(element.clauses, **kw)}) - 2440587.5 AS INTEGER)"
+
+
+@compiles(days_since_epoch, "postgresql")
+def _pg_days_since_epoch(element, compiler, **kw):
+    return f"({compiler.process(element.clauses, **kw)} - DATE '1970-01-01')"
+
+
+def frame_stmt(date_from: date | None = None, date_to: date | None = None):
+    """SELECT of the integer columns load_frame reads, for the date window."""
+    stmt = select(
+        days_since_epoch(Transaction.date).label("day"),
+        cast(func.round(Transaction.amount * 100), BigInteger).label("cents"),
+        case((Transaction.type == "income", 1), else_=0).label("income"),
+        Transaction.category_id,
+    )
+    where = transaction_filters(date_from=date_from, date_to=date_to)
+    if where:
+        stmt = stmt.where(and_(*where))
+    return stmt
+
+
+FRAME_COLUMNS = ["day", "cents", "income", "category_id"]
+FRAME_DTYPE = {"day": np.int32, "cents": np.int64, "income": np.int8, "category_id": np.int32}
+
+
+def _frame_sql(dialect, date_from: date | None, date_to: date | None) -> str:
+    # COPY takes no bind parameters
+    return str(frame_stmt(date_from, date_to).compile(
+        dialect=dialect, compile_kwargs={"literal_binds": True}
+    ))
+
+
+def _read_copy(buf) -> pd.DataFrame:
+    buf.seek(0)
+    return pd.read_csv(buf, header=None, names=FRAME_COLUMNS, dtype=FRAME_DTYPE)
+
+
+def load_frame(conn, date_from: date | None = None, date_to: date | None = None) -> pd.DataFrame:
+    """
+    Fetch the window's transactions into a DataFrame of int columns
+    (day since 1970-01-01, cents, income 0/1, category_id) with one COPY.
+    """
+    if conn.dialect.name != "postgresql":
+        rows = conn.execute(frame_stmt(date_from, date_to)).all()
+        return pd.DataFrame(rows, columns=FRAME_COLUMNS).astype(FRAME_DTYPE)
+
+    copy_sql = f"COPY ({_frame_sql(conn.dialect, date_from, date_to)}) TO STDOUT WITH (FORMAT csv)"
+    buf = io.StringIO()
+    raw = conn.connection.driver_connection
+    with raw.cursor() as cur:
+        if hasattr(cur, "copy_expert"):  # psycopg2
+            cur.copy_expert(copy_sql, buf)
+        else:                            # psycopg 3
+            with cur.copy(copy_sql) as copy:
+                for data in copy:
+                    buf.write(bytes(data).decode())
+    return _read_copy(buf)
+
+
+async def load_frame_async(session, date_from: date | None = None, date_to: date | None = None) -> pd.DataFrame:
+    """load_frame on an AsyncSession (asyncpg, see app.db_async)."""
+    conn = await session.connection()
+    raw = (await conn.get_raw_connection()).driver_connection
+    buf = io.BytesIO()
+
+    async def write(data: bytes) -> None:
+        buf.write(data)
+
+    await raw.copy_from_query(_frame_sql(conn.dialect, date_from, date_to), output=write, format="csv")
+    return _read_copy(buf)
+
+
+# ---------- series ----------
+def _period_index(days: np.ndarray, freq: str) -> np.ndarray:
+    """Period number of each day: months since 1970-01, or weeks (Monday-based)."""
+    if freq == "month":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    if freq == "week":
+        return (days.astype(np.int64) + 3) // 7  # 1970-01-01 was a Thursday
+    raise ValueError(f"unknown frequency {freq!r} (expected 'month' or 'week')")
+
+
+def _period_labels(first: int, n: int, freq: str) -> pd.DatetimeIndex:
+    periods = np.arange(first, first + n)
+    if freq == "month":
+        return pd.DatetimeIndex(periods.astype("datetime64[M]").astype("datetime64[ns]"))
+    return pd.DatetimeIndex((periods * 7 - 3).astype("datetime64[D]").astype("datetime64[ns]"))
+
+
+def _window(df: pd.DataFrame, freq: str, date_from: date | None, date_to: date | None):
+    """(period of each row, first period, number of periods) covering the window."""
+    idx = _period_index(df["day"].to_numpy(), freq)
+    bounds = [(d - EPOCH).days for d in (date_from, date_to) if d is not None]
+    if len(bounds) < 2 and len(idx):
+        bounds += [int(df["day"].min()), int(df["day"].max())]
+    if not bounds:
+        return idx, 0, 0
+    lo, hi = _period_index(np.array([min(bounds), max(bounds)]), freq)
+    return idx, int(lo), int(hi - lo + 1)
+
+
+def period_totals(df: pd.DataFrame, freq: str = "month",
+                  date_from: date | None = None, date_to: date | None = None) -> pd.DataFrame:
+    """
+    income / expense / net per month or week (freq "month" | "week"),
+    including empty periods, indexed by period start.
+    """
+    idx, first, n = _window(df, freq, date_from, date_to)
+    pos = idx - first
+    keep = (pos >= 0) & (pos < n)
+    pos = pos[keep]
+    cents = df["cents"].to_numpy()[keep].astype(np.float64)
+    is_income = df["income"].to_numpy()[keep].astype(bool)
+
+    income = np.bincount(pos[is_income], weights=cents[is_income], minlength=n)[:n] / 100
+    expense = np.bincount(pos[~is_income], weights=cents[~is_income], minlength=n)[:n] / 100
+    return pd.DataFrame(
+        {"income": income, "expense": expense, "net": income - expense},
+        index=_period_labels(first, n, freq),
+    )
+
+
+def rolling_average(totals: pd.DataFrame, window: int = ROLLING_MONTHS) -> pd.DataFrame:
+    """Trailing mean over `window` periods (shorter at the start)."""
+    return totals.rolling(window, min_periods=1).mean()
+
+
+def category_trends(df: pd.DataFrame, category_names: dict[int, str],
+                    months: int = TREND_MONTHS, date_to: date | None = None):
+    """
+    Expense per category over the last `months` months up to date_to.
+    Returns (monthly, trends): monthly is months x categories; trends has
+    total, monthly_mean, slope (least-squares change per month) and last
+    month per category, largest total first.
+    """
+    expenses = df[df["income"].to_numpy() == 0]
+    if date_to is None:
+        date_to = EPOCH + timedelta(days=int(df["day"].max())) if len(df) else date.today()
+    end = int(_period_index(np.array([(date_to - EPOCH).days]), "month")[0])
+    first = end - months + 1
+
+    pos = _period_index(expenses["day"].to_numpy(), "month") - first
+    keep = (pos >= 0) & (pos < months)
+    cat_ids, code = np.unique(expenses["category_id"].to_numpy()[keep], return_inverse=True)
+    cells = np.bincount(
+        pos[keep] * len(cat_ids) + code,
+        weights=expenses["cents"].to_numpy()[keep].astype(np.float64),
+        minlength=months * len(cat_ids),
+    )
+    grid = cells.reshape(months, len(cat_ids)) / 100
+
+    names = [category_names.get(int(c), f"Category {c}") for c in cat_ids]
+    monthly = pd.DataFrame(grid, index=_period_labels(first, months, "month"), columns=names)
+    slope = np.polyfit(np.arange(months), grid, 1)[0] if months > 1 and len(cat_ids) else 0.0
+    trends = pd.DataFrame(
+        {
+            "total": grid.sum(axis=0),
+            "monthly_mean": grid.mean(axis=0),
+            "slope": slope,
+            "last": grid[-1] if months else 0.0,
+        },
+        index=names,
+    ).sort_values("total", ascending=False)
+    return monthly, trends
+
+
+def compute(df: pd.DataFrame, category_names: dict[int, str],
+            date_from: date | None = None, date_to: date | None = None) -> Analytics:
+    """All dashboard series for a frame from load_frame."""
+    monthly = period_totals(df, "month", date_from, date_to)
+    cat_monthly, trends = category_trends(df, category_names, date_to=date_to)
+    return Analytics(
+        monthly=monthly,
+        weekly=period_totals(df, "week", date_from, date_to),
+        monthly_rolling=rolling_average(monthly),
+        category_monthly=cat_monthly,
+        category_trends=trends,
+    )
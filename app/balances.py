@@ -0,0 +1,203 @@
+# app/balances.py
+"""
+Per-account balances backed by monthly checkpoints.
+
+account_balance_checkpoints holds, for each account and each month in which
+it has transactions, the closing balance at the end of that month (income
+adds, expense subtracts). The balance of an account on any day is the last
+checkpoint before that day's month plus the rows of the month itself: one
+index lookup and a delta sum over at most a month of rows.
+
+ORM writes keep the checkpoints current through a before_flush hook, so
+TransactionDialog.on_save and delete_transaction (and any other ORM write)
+update them in the same transaction. Bulk SQL paths call
+apply_deltas() with what they changed (app.db.delete_transactions,
+update_transactions, the CSV importer). rebuild_checkpoints() recomputes
+them from scratch and is a repair tool, for after editing `transactions`
+by hand.
+
+Detaching a month's partition leaves the checkpoints alone, so archived
+rows keep counting towards later balances; rebuild_checkpoints() only sees
+the rows still attached.
+"""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event, func, inspect, select, text, case, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from .models import BalanceCheckpoint, Transaction
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def signed_amount():
+    """amount for income, -amount for expense."""
+    return case((Transaction.type == "income", Transaction.amount), else_=-Transaction.amount)
+
+
+# ---------- reading ----------
+def balance_on_expr(account_id, day: date | None = None, month=None):
+    """
+    Scalar SQL expression: balance of `account_id` at the end of `day`
+    (None: after its latest transaction). `account_id` is an id or a column
+    of the enclosing query (e.g. Account.id, one balance per account).
+    `day` may be a bound parameter; `month` (the start of day's month) then
+    has to be one too.
+    """
+    last = select(BalanceCheckpoint.balance).where(BalanceCheckpoint.account_id == account_id)
+    if day is None:
+        return func.coalesce(
+            last.order_by(BalanceCheckpoint.month.desc()).limit(1).scalar_subquery(), 0
+        )
+
+    first = month_start(day) if month is None else month
+    before = (
+        last.where(BalanceCheckpoint.month < first)
+        .order_by(BalanceCheckpoint.month.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    in_month = (
+        select(func.sum(signed_amount()))
+        .where(and_(Transaction.account_id == account_id,
+                    Transaction.date >= first, Transaction.date <= day))
+        .scalar_subquery()
+    )
+    return func.coalesce(before, 0) + func.coalesce(in_month, 0)
+
+
+def balance_on(session, account_id: int, day: date | None = None) -> Decimal:
+    """Balance of `account_id` at the end of `day` (None: current)."""
+    return Decimal(session.scalar(select(balance_on_expr(account_id, day))))
+
+
+# ---------- maintenance ----------
+def apply_delta(session, account_id: int, day: date, delta: Decimal) -> None:
+    """
+    Add `delta` to the balance of `account_id` from `day` on: creates the
+    checkpoint of day's month if missing (carrying the previous closing
+    balance forward), then shifts that and every later checkpoint.
+    """
+    month = month_start(day)
+    carried = (
+        select(BalanceCheckpoint.balance)
+        .where(BalanceCheckpoint.account_id == account_id, BalanceCheckpoint.month < month)
+        .order_by(BalanceCheckpoint.month.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    session.execute(
+        insert(BalanceCheckpoint)
+        .values(account_id=account_id, month=month, balance=func.coalesce(carried, 0))
+        .on_conflict_do_nothing()
+    )
+    session.execute(
+        BalanceCheckpoint.__table__.update()
+        .where(BalanceCheckpoint.account_id == account_id, BalanceCheckpoint.month >= month)
+        .values(balance=BalanceCheckpoint.balance + delta)
+    )
+
+
+def apply_deltas(conn, deltas: dict[tuple[int, date], Decimal]) -> None:
+    """
+    apply_delta for many {(account_id, month start): delta} at once, in two
+    statements: create the missing checkpoints, then shift every checkpoint
+    by the sum of the deltas at or before its month.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    params = {
+        "accounts": [account_id for account_id, _ in deltas],
+        "months": [month for _, month in deltas],
+        "deltas": list(deltas.values()),
+    }
+    conn.execute(text(
+        """
+        INSERT INTO account_balance_checkpoints (account_id, month, balance)
+        SELECT d.account_id, d.month, coalesce((
+            SELECT c.balance FROM account_balance_checkpoints AS c
+            WHERE c.account_id = d.account_id AND c.month < d.month
+            ORDER BY c.month DESC LIMIT 1
+        ), 0)
+        FROM unnest(CAST(:accounts AS integer[]), CAST(:months AS date[])) AS d (account_id, month)
+        ON CONFLICT DO NOTHING
+        """
+    ), params)
+    conn.execute(text(
+        """
+        UPDATE account_balance_checkpoints AS c
+        SET balance = c.balance + s.shift
+        FROM (
+            SELECT c.account_id, c.month, sum(d.delta) AS shift
+            FROM account_balance_checkpoints AS c
+            JOIN unnest(CAST(:accounts AS integer[]), CAST(:months AS date[]), CAST(:deltas AS numeric[]))
+                 AS d (account_id, month, delta)
+              ON d.account_id = c.account_id AND d.month <= c.month
+            GROUP BY c.account_id, c.month
+        ) AS s
+        WHERE c.account_id = s.account_id AND c.month = s.month
+        """
+    ), params)
+
+
+def rebuild_checkpoints(conn, account_ids=None) -> None:
+    """Recompute the checkpoints of `account_ids` (default: all accounts) from transactions."""
+    where = "" if account_ids is None else "WHERE account_id = ANY(:ids)"
+    params = {} if account_ids is None else {"ids": list(account_ids)}
+    conn.execute(text(f"DELETE FROM account_balance_checkpoints {where}"), params)
+    conn.execute(text(
+        f"""
+        INSERT INTO account_balance_checkpoints (account_id, month, balance)
+        SELECT account_id, month, sum(delta) OVER (PARTITION BY account_id ORDER BY month)
+        FROM (
+            SELECT account_id,
+                   date_trunc('month', date)::date AS month,
+                   sum(CASE WHEN type = 'income' THEN amount ELSE -amount END) AS delta
+            FROM transactions
+            {where}
+            GROUP BY 1, 2
+        ) AS monthly
+        """
+    ), params)
+
+
+# ---------- incremental updates on ORM writes ----------
+def _committed(obj, key: str):
+    # value as of the last flush, before any pending change
+    hist = inspect(obj).attrs[key].history
+    return hist.deleted[0] if hist.deleted else getattr(obj, key)
+
+
+def _effect(account_id, day, typ, amount, sign: int):
+    return (account_id, month_start(day)), sign * (amount if typ == "income" else -amount)
+
+
+@event.listens_for(Session, "before_flush")
+def _update_checkpoints(session, flush_context, instances):
+    deltas: dict[tuple[int, date], Decimal] = {}
+
+    def add(effect):
+        key, delta = effect
+        deltas[key] = deltas.get(key, 0) + delta
+
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            add(_effect(obj.account_id, obj.date, obj.type, Decimal(obj.amount), +1))
+    for obj in session.dirty:
+        if isinstance(obj, Transaction) and session.is_modified(obj):
+            add(_effect(_committed(obj, "account_id"), _committed(obj, "date"),
+                        _committed(obj, "type"), Decimal(_committed(obj, "amount")), -1))
+            add(_effect(obj.account_id, obj.date, obj.type, Decimal(obj.amount), +1))
+    for obj in session.deleted:
+        if isinstance(obj, Transaction):
+            add(_effect(_committed(obj, "account_id"), _committed(obj, "date"),
+                        _committed(obj, "type"), Decimal(_committed(obj, "amount")), -1))
+
+    for (account_id, month), delta in deltas.items():
+        if delta:
+            apply_delta(session, account_id, month, delta)
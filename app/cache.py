@@ -0,0 +1,60 @@
+# app/cache.py
+"""
+Small LRU cache for results derived from the database.
+
+Every entry is stored with the data version (app.db.data_version) it was
+computed under and is only served while the current version is equal, so
+writes from this or any other process expire it without explicit
+invalidation. The least recently used key is evicted once `maxsize` keys
+are held (e.g. different date windows of the dashboard).
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class ResultCache:
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[Hashable, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: Hashable, default=None):
+        """The value stored for `key` under `version`, else `default`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: Hashable, value) -> None:
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, version: Hashable, compute: Callable[[], Any]):
+        """
+        Cached value of `key` under `version`, calling compute() on a miss.
+        compute() runs outside the lock; two threads missing together both
+        compute and the later one is kept.
+        """
+        marker = object()
+        value = self.get(key, version, marker)
+        if value is marker:
+            value = compute()
+            self.put(key, version, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
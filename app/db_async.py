@@ -0,0 +1,155 @@
+# app/db_async.py
+"""
+asyncio variant of the app.db helpers, on SQLAlchemy's AsyncEngine over
+asyncpg (optional: pip install .[async]).
+
+The statements are the ones app.db builds; only the execution differs.
+Independent queries run concurrently, each on its own pooled connection:
+
+    totals, by_category, names = await fan_out(
+        partial(get_totals, date_from=d0, date_to=d1),
+        partial(get_expense_by_category, date_from=d0, date_to=d1),
+        get_category_names,
+    )
+
+Sync code (Tk worker jobs, the report CLI) calls run(coro), which runs the
+coroutine on a background event loop shared by the process. asyncpg
+connections belong to the loop that opened them, so every loop gets its
+own engine and pool (get_async_engine; sized by app.db.pool_options).
+"""
+import asyncio
+import importlib.util
+import threading
+import weakref
+from datetime import date
+from decimal import Decimal
+from typing import Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from .db import database_url, expense_by_category_stmt, pool_options, totals_stmt, transactions_stmt
+from .models import Category, Transaction
+
+ASYNC_DRIVER = "postgresql+asyncpg"
+
+_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object]" = weakref.WeakKeyDictionary()
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def available() -> bool:
+    """True when asyncpg is installed."""
+    return importlib.util.find_spec("asyncpg") is not None
+
+
+def async_database_url() -> str:
+    """DATABASE_URL with the asyncpg driver."""
+    url = make_url(database_url()).set(drivername=ASYNC_DRIVER)
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    """The AsyncEngine of the running event loop, created on first use."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    loop = asyncio.get_running_loop()
+    engine = _engines.get(loop)
+    if engine is None:
+        engine = create_async_engine(async_database_url(), pool_pre_ping=True, **pool_options())
+        _engines[loop] = engine
+    return engine
+
+
+def async_session():
+    """A new AsyncSession on this loop's engine, for `async with`."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    return AsyncSession(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def dispose() -> None:
+    """Close the pooled connections of this loop's engine."""
+    engine = _engines.pop(asyncio.get_running_loop(), None)
+    if engine is not None:
+        await engine.dispose()
+
+
+# ---------- sync bridge ----------
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="db-async", daemon=True).start()
+        return _loop
+
+
+def run(coro: Awaitable):
+    """Run `coro` on the background loop and wait for its result (from sync code)."""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+async def fan_out(*calls: Callable[..., Awaitable]) -> list:
+    """
+    Await call(session) for every call at once, each with its own session
+    (an AsyncSession runs one statement at a time); results in call order.
+    """
+    async def one(call):
+        async with async_session() as s:
+            return await call(s)
+
+    return list(await asyncio.gather(*(one(call) for call in calls)))
+
+
+# ---------- helpers (same arguments and results as in app.db) ----------
+async def get_transactions(
+    session,
+    tx_type: str | None = None,
+    category_id: int | None = None,
+    account_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    notes_query: str | None = None,
+) -> list[Transaction]:
+    stmt, params = transactions_stmt(tx_type, category_id, account_id, date_from, date_to, notes_query)
+    return (await session.execute(stmt, params)).scalars().all()
+
+
+async def delete_transaction(session, tx_id: int) -> bool:
+    """Delete a transaction by ID. Returns True if deleted, False if not found."""
+    tx = await session.get(Transaction, tx_id)
+    if not tx:
+        return False
+    await session.delete(tx)
+    await session.commit()
+    return True
+
+
+async def get_totals(
+    session,
+    tx_type: str | None = None,
+    category_id: int | None = None,
+    account_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    notes_query: str | None = None,
+) -> tuple[Decimal, Decimal]:
+    stmt, params = totals_stmt(tx_type, category_id, account_id, date_from, date_to, notes_query)
+    income, expense = (await session.execute(stmt, params)).one()
+    return Decimal(income), Decimal(expense)
+
+
+async def get_expense_by_category(
+    session,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[tuple[str, Decimal]]:
+    stmt = expense_by_category_stmt(date_from, date_to)
+    return [(name, Decimal(value)) for name, value in (await session.execute(stmt)).all()]
+
+
+async def get_category_names(session) -> dict[int, str]:
+    """id -> name, in name order (as refdata.category_names)."""
+    rows = await session.execute(select(Category.id, Category.name).order_by(Category.name))
+    return dict(rows.all())
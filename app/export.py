@@ -0,0 +1,288 @@
+# app/export.py
+"""
+Streaming exports of the filtered transactions.
+
+Rows come from a server-side cursor in chunks, so memory does not depend on
+the row count. CSV is the layout Import CSV reads back; Parquet and Arrow
+(optional, need pyarrow) are typed and columnar: one row group or record
+batch per chunk, dates as date32, amounts as decimal128(12, 2) and
+dictionary-encoded type/account/category columns.
+"""
+import argparse
+import csv
+import os
+import pathlib
+import sys
+import time
+import threading
+from datetime import date
+from typing import Callable, NamedTuple
+
+from sqlalchemy import and_
+
+from .db import transaction_filters, projection_select
+from .models import Transaction
+
+EXPORT_COLUMNS = ["id", "date", "type", "amount", "account", "category", "notes"]
+CHUNK_SIZE = 5000
+COLUMNAR_CHUNK_SIZE = 100_000  # rows per Parquet row group / Arrow record batch
+FORMATS = ("csv", "parquet", "arrow")
+
+
+class ExportCancelled(Exception):
+    """Raised by the writers when the cancel event is set mid-export."""
+
+
+class ExportReport(NamedTuple):
+    rows: int
+    size: int      # bytes written
+    csv_size: int  # bytes the same rows take as CSV
+
+    @property
+    def ratio(self) -> float:
+        """How many times smaller than the CSV export."""
+        return self.csv_size / self.size if self.size else 0.0
+
+
+def default_export_path(ext: str = "csv") -> pathlib.Path:
+    project_root = pathlib.Path(__file__).resolve().parents[1]  # <repo root>
+    outdir = project_root / "exports"
+    outdir.mkdir(exist_ok=True)
+    return outdir / f"transactions_{time.strftime('%Y%m%d_%H%M%S')}.{ext}"
+
+
+def export_stmt(**filters):
+    """
+    SELECT only the exported columns, with account/category names joined in SQL,
+    in the same (date desc, id desc) order as the main window.
+    """
+    stmt = projection_select(EXPORT_COLUMNS)
+    where = transaction_filters(**filters)
+    if where:
+        stmt = stmt.where(and_(*where))
+    return stmt.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+
+def iter_export_chunks(session, chunk_size: int = CHUNK_SIZE, **filters):
+    """
+    Yield lists of at most `chunk_size` row tuples.
+    Rows come from a server-side cursor, so only one chunk is in memory at a time.
+    """
+    result = session.execute(
+        export_stmt(**filters),
+        execution_options={"stream_results": True, "yield_per": chunk_size},
+    )
+    try:
+        for chunk in result.partitions():
+            yield chunk
+    finally:
+        result.close()
+
+
+def write_csv(
+    session,
+    path: os.PathLike | str,
+    filters: dict,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> int:
+    """
+    Stream the filtered transactions to `path` in the export_csv layout.
+    Calls progress(rows_written) after each chunk; raises ExportCancelled (and
+    removes the partial file) when `cancel` is set. Returns the row count.
+    """
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".part")
+    written = 0
+    try:
+        with tmp.open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(EXPORT_COLUMNS)
+            for chunk in iter_export_chunks(session, chunk_size, **filters):
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled(f"cancelled after {written} rows")
+                w.writerows(_csv_rows(chunk))
+                written += len(chunk)
+                if progress is not None:
+                    progress(written)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return written
+
+
+def _csv_rows(chunk):
+    return (
+        (tx_id, d.isoformat(), typ, f"{amount:.2f}", acc, cat, notes or "")
+        for tx_id, d, typ, amount, acc, cat, notes in chunk
+    )
+
+
+def format_of(path: os.PathLike | str) -> str:
+    """Export format from the file suffix (.csv, .parquet/.pq, .arrow/.feather)."""
+    suffix = pathlib.Path(path).suffix.lower()
+    formats = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+    if suffix not in formats:
+        raise ValueError(f"unknown export format {suffix!r} (use .csv, .parquet or .arrow)")
+    return formats[suffix]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError(
+            "Parquet/Arrow export needs pyarrow: pip install 'personal-finance-tracker[columnar]'"
+        ) from None
+    return pyarrow
+
+
+def arrow_schema(pa):
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("id", pa.int32()),
+        ("date", pa.date32()),
+        ("type", dictionary),
+        ("amount", pa.decimal128(12, 2)),
+        ("account", dictionary),
+        ("category", dictionary),
+        ("notes", pa.string()),
+    ])
+
+
+def _record_batch(pa, schema, chunk):
+    ids, dates, types, amounts, accounts, categories, notes = zip(*chunk)
+    arrays = [
+        pa.array(ids, pa.int32()),
+        pa.array(dates, pa.date32()),
+        pa.array(types, pa.string()).dictionary_encode(),
+        pa.array(amounts, pa.decimal128(12, 2)),
+        pa.array(accounts, pa.string()).dictionary_encode(),
+        pa.array(categories, pa.string()).dictionary_encode(),
+        pa.array(notes, pa.string()),
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _csv_size(pa, batch) -> int:
+    """Bytes `batch` takes in the CSV layout, worked out on the Arrow columns."""
+    pc = pa.compute
+    # separators and \r\n per row, ISO dates are always 10 characters
+    size = batch.num_rows * (len(EXPORT_COLUMNS) - 1 + 2 + 10)
+    for name in ("id", "type", "amount", "account", "category", "notes"):
+        col = batch.column(name)
+        if pa.types.is_dictionary(col.type):
+            col = col.dictionary_decode()
+        col = pc.cast(col, pa.string())
+        size += pc.sum(pc.binary_length(col)).as_py() or 0
+        # fields with a quote, comma or newline are quoted, inner quotes doubled
+        quoted = pc.sum(pc.cast(pc.match_substring_regex(col, r'[",\r\n]'), pa.int64())).as_py() or 0
+        size += 2 * quoted + (pc.sum(pc.count_substring(col, '"')).as_py() or 0)
+    return size
+
+
+def write_columnar(
+    session,
+    path: os.PathLike | str,
+    filters: dict,
+    fmt: str = "parquet",
+    chunk_size: int = COLUMNAR_CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> ExportReport:
+    """
+    Stream the filtered transactions to `path` as Parquet (one zstd row group
+    per chunk) or an Arrow IPC stream (one record batch per chunk). Only
+    one chunk is in memory at a time. progress/cancel work as in write_csv.
+    The report compares the file size with the CSV export of the same rows.
+    """
+    pa = _pyarrow()
+    schema = arrow_schema(pa)
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".part")
+    written = csv_size = 0
+    try:
+        if fmt == "parquet":
+            writer = pa.parquet.ParquetWriter(tmp, schema, compression="zstd")
+            write = writer.write_batch
+        elif fmt == "arrow":
+            writer = pa.ipc.new_stream(tmp, schema)
+            write = writer.write_batch
+        else:
+            raise ValueError(f"unknown columnar format {fmt!r}")
+        with writer:
+            for chunk in iter_export_chunks(session, chunk_size, **filters):
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled(f"cancelled after {written} rows")
+                batch = _record_batch(pa, schema, chunk)
+                write(batch)
+                csv_size += _csv_size(pa, batch)
+                written += len(chunk)
+                if progress is not None:
+                    progress(written)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    csv_size += len(",".join(EXPORT_COLUMNS)) + 2  # header line
+    return ExportReport(written, path.stat().st_size, csv_size)
+
+
+def export(session, path: os.PathLike | str, filters: dict, **kwargs) -> ExportReport:
+    """Export to `path` in the format its suffix names (see format_of)."""
+    fmt = format_of(path)
+    if fmt != "csv":
+        return write_columnar(session, path, filters, fmt, **kwargs)
+    rows = write_csv(session, path, filters, **kwargs)
+    size = pathlib.Path(path).stat().st_size
+    return ExportReport(rows, size, size)
+
+
+def _date(s: str) -> date:
+    try:
+        return date.fromisoformat(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {s!r}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Export transactions to CSV, Parquet or Arrow.")
+    ap.add_argument("output", help="file to write; the suffix picks the format (.csv, .parquet, .arrow)")
+    ap.add_argument("--from", dest="date_from", type=_date, metavar="YYYY-MM-DD")
+    ap.add_argument("--to", dest="date_to", type=_date, metavar="YYYY-MM-DD")
+    ap.add_argument("--type", dest="tx_type", choices=("income", "expense"))
+    ap.add_argument("--account", help="account name")
+    ap.add_argument("--category", help="category name")
+    ap.add_argument("--search", dest="notes_query", help="notes search text")
+    args = ap.parse_args()
+
+    from app.db import SessionLocal
+    from app.refdata import refdata
+
+    filters = dict(
+        tx_type=args.tx_type,
+        account_id=refdata.account_id(args.account),
+        category_id=refdata.category_id(args.category),
+        date_from=args.date_from,
+        date_to=args.date_to,
+        notes_query=args.notes_query,
+    )
+    for name, value, key in (("account", args.account, "account_id"), ("category", args.category, "category_id")):
+        if value and filters[key] is None:
+            raise SystemExit(f"unknown {name} {value!r}")
+
+    with SessionLocal() as s:
+        report = export(s, args.output, filters)
+    summary = f"{report.size:,} bytes"
+    if format_of(args.output) != "csv":
+        summary += f", {report.ratio:.1f}x smaller than CSV"
+    print(f"✅ Exported {report.rows} rows to {args.output} ({summary})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
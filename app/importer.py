@@ -0,0 +1,208 @@
+# app/importer.py
+"""
+Bulk CSV import.
+
+Reads files in the layout written by Export CSV (id, date, type, amount,
+account, category, notes; the id column is ignored), validates them in
+vectorized pandas batches, COPYs the valid rows into a temporary staging
+table and moves them into `transactions` with a single INSERT ... SELECT.
+
+    finance-tracker-import bank_history.csv [--dry-run] [--rejects bad.csv]
+"""
+import argparse
+import csv
+import io
+import sys
+import threading
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from .balances import apply_deltas
+
+REQUIRED_COLUMNS = ["date", "type", "amount", "account", "category", "notes"]
+CHUNK_SIZE = 100_000
+AMOUNT_RE = r"\d{1,10}(?:\.\d{1,2})?"  # fits Numeric(12, 2), no sign
+
+
+class ImportCancelled(Exception):
+    """Raised when the cancel event is set mid-import; nothing is inserted."""
+
+
+class ImportReport(NamedTuple):
+    inserted: int
+    rejected: list[tuple[int, str]]  # (data row number, reason)
+
+
+def load_reference_ids(conn) -> tuple[dict[str, int], dict[str, int], dict[str, str]]:
+    """Resolve every account/category name in two queries: (acc_ids, cat_ids, cat_types)."""
+    acc_ids = dict(conn.execute(text("SELECT name, id FROM accounts")).all())
+    cats = conn.execute(text("SELECT name, id, type FROM categories")).all()
+    return acc_ids, {n: i for n, i, _ in cats}, {n: t for n, _, t in cats}
+
+
+def validate_chunk(df: pd.DataFrame, acc_ids, cat_ids, cat_types):
+    """
+    Validate one batch column-wise. Returns (staging_frame, rejected) where
+    rejected is [(row, reason), ...] with the first failing check per row.
+    """
+    dates = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce")
+    acc = df["account"].map(acc_ids)
+    cat = df["category"].map(cat_ids)
+
+    checks = [
+        (dates.isna(), "invalid date (expected YYYY-MM-DD)"),
+        (~df["amount"].str.fullmatch(AMOUNT_RE), "invalid amount"),
+        (~df["type"].isin(("income", "expense")), "type must be 'income' or 'expense'"),
+        (acc.isna(), "unknown account"),
+        (cat.isna(), "unknown category"),
+        (df["category"].map(cat_types) != df["type"], "category does not match type"),
+        (df["notes"].str.len() > 255, "notes longer than 255 characters"),
+    ]
+    why = np.select([m.to_numpy() for m, _ in checks], [r for _, r in checks], default="")
+    bad = why != ""
+
+    rows = df.index.to_numpy() + 1
+    rejected = list(zip(rows[bad].tolist(), why[bad].tolist()))
+
+    ok = ~bad
+    staging = pd.DataFrame({
+        "row": rows[ok],
+        "date": df["date"].to_numpy()[ok],
+        "amount": df["amount"].to_numpy()[ok],
+        "type": df["type"].to_numpy()[ok],
+        "category_id": cat.to_numpy()[ok].astype("int64"),
+        "account_id": acc.to_numpy()[ok].astype("int64"),
+        "notes": df["notes"].to_numpy()[ok],
+    })
+    return staging, rejected
+
+
+def copy_frame(conn, table: str, frame: pd.DataFrame) -> None:
+    """COPY a DataFrame into `table` over the connection's DBAPI cursor."""
+    buf = io.StringIO()
+    frame.to_csv(buf, header=False, index=False)
+    buf.seek(0)
+    sql = f"COPY {table} ({', '.join(frame.columns)}) FROM STDIN WITH (FORMAT csv)"
+
+    raw = conn.connection.driver_connection
+    with raw.cursor() as cur:
+        if hasattr(cur, "copy_expert"):  # psycopg2
+            cur.copy_expert(sql, buf)
+        else:                            # psycopg 3
+            with cur.copy(sql) as copy:
+                copy.write(buf.getvalue())
+
+
+def import_csv(
+    conn,
+    source,
+    chunk_size: int = CHUNK_SIZE,
+    dry_run: bool = False,
+    progress: Callable[[int], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> ImportReport:
+    """
+    Import `source` (path or text file) inside the caller's transaction on
+    `conn`. Invalid rows are skipped and reported; valid rows are inserted
+    with one INSERT ... SELECT at the end (nothing is inserted if dry_run).
+    """
+    acc_ids, cat_ids, cat_types = load_reference_ids(conn)
+    if not dry_run:
+        conn.execute(text(
+            """
+            CREATE TEMP TABLE import_staging (
+                row integer,
+                date date,
+                amount numeric(12, 2),
+                type varchar(10),
+                category_id integer,
+                account_id integer,
+                notes varchar(255)
+            ) ON COMMIT DROP
+            """
+        ))
+
+    rejected: list[tuple[int, str]] = []
+    read = 0
+    reader = pd.read_csv(
+        source, dtype=str, keep_default_na=False, na_filter=False, chunksize=chunk_size
+    )
+    for df in reader:
+        missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+        if cancel is not None and cancel.is_set():
+            raise ImportCancelled(f"cancelled after {read} rows")
+
+        staging, bad = validate_chunk(df, acc_ids, cat_ids, cat_types)
+        rejected.extend(bad)
+        if not dry_run and len(staging):
+            copy_frame(conn, "import_staging", staging)
+
+        read += len(df)
+        if progress is not None:
+            progress(read)
+
+    if dry_run:
+        return ImportReport(read - len(rejected), rejected)
+
+    # monthly partitions for the imported range, so rows skip the DEFAULT partition
+    conn.execute(text(
+        """
+        SELECT ensure_transaction_partitions(min(date), max(date))
+        FROM import_staging HAVING count(*) > 0
+        """
+    ))
+    inserted = conn.execute(text(
+        """
+        INSERT INTO transactions (date, amount, type, category_id, account_id, notes)
+        SELECT date, amount, type, category_id, account_id, notes
+        FROM import_staging
+        ORDER BY row
+        """
+    )).rowcount
+    # shift the checkpoints by what the import added, per account and month
+    deltas = conn.execute(text(
+        """
+        SELECT account_id, date_trunc('month', date)::date,
+               sum(CASE WHEN type = 'income' THEN amount ELSE -amount END)
+        FROM import_staging
+        GROUP BY 1, 2
+        """
+    )).all()
+    apply_deltas(conn, {(account_id, month): delta for account_id, month, delta in deltas})
+    return ImportReport(inserted, rejected)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Bulk-import transactions from an exported CSV.")
+    ap.add_argument("csv", help="file in the Export CSV layout")
+    ap.add_argument("--dry-run", action="store_true", help="validate only, insert nothing")
+    ap.add_argument("--rejects", help="write rejected rows (row, reason) to this CSV")
+    ap.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = ap.parse_args()
+
+    from app.db import get_engine
+
+    with get_engine().begin() as conn:
+        report = import_csv(conn, args.csv, chunk_size=args.chunk_size, dry_run=args.dry_run)
+
+    verb = "Validated" if args.dry_run else "Imported"
+    print(f"✅ {verb} {report.inserted} rows, rejected {len(report.rejected)}.")
+    for row, reason in report.rejected[:20]:
+        print(f"  row {row}: {reason}", file=sys.stderr)
+    if len(report.rejected) > 20:
+        print(f"  ... and {len(report.rejected) - 20} more", file=sys.stderr)
+
+    if args.rejects and report.rejected:
+        with open(args.rejects, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["row", "reason"])
+            w.writerows(report.rejected)
+
+
+if __name__ == "__main__":
+    main()
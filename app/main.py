@@ -1,10 +1,56 @@
+import argparse
+import json
+import logging
 import os
 from dotenv import load_dotenv
 from sqlalchemy import text
 from sqlalchemy.engine import create_engine
 
 
+def profile_workload(slow_ms: float) -> dict:
+    """
+    Run the queries behind the main window's actions once (read-only)
+    under the profiler and return its summary.
+    """
+    from app import profiling
+    from app.db import (engine, SessionLocal, get_first_page, get_transactions_page,
+                        get_totals, get_expense_by_category, pool_stats)
+    from app.refdata import refdata
+
+    profiler = profiling.QueryProfiler(slow_ms=slow_ms)
+    profiler.enable(engine)
+    try:
+        with profiling.action("filter-options"):
+            refdata.invalidate()
+            refdata.account_names()
+        with SessionLocal() as s:
+            with profiling.action("refresh"):
+                rows, _, _ = get_first_page(s)
+                get_first_page(s, tx_type="expense")
+            if rows:
+                with profiling.action("table-page"):
+                    get_transactions_page(s, after=(rows[-1].date, rows[-1].id))
+            with profiling.action("search"):
+                get_first_page(s, notes_query="a", ranked=True)
+            with profiling.action("dashboard"):
+                get_totals(s)
+                get_expense_by_category(s)
+    finally:
+        profiler.disable()
+    return {**profiler.summary(), "pool": pool_stats()._asdict()}
+
+
 def main() -> None:
+    ap = argparse.ArgumentParser(description="Check the database connection.")
+    ap.add_argument(
+        "--profile", nargs="?", const="", metavar="SESSION_JSON",
+        help="profile the app's queries once, or show a summary saved by a "
+             "FINANCE_PROFILE=1 GUI session",
+    )
+    ap.add_argument("--json", metavar="OUT", help="with --profile: also write the summary as JSON")
+    ap.add_argument("--slow-ms", type=float, default=None, help="slow-query threshold (ms)")
+    args = ap.parse_args()
+
     # Force .env to override anything else
     load_dotenv(override=True)
 
@@ -20,6 +66,25 @@ def main() -> None:
         print("✅ Connected to PostgreSQL")
         print(version)
 
+    if args.profile is None:
+        return
+
+    from app import profiling
+
+    profiling.log.setLevel(logging.ERROR)  # slow queries are listed in the report instead
+    if args.profile:
+        with open(args.profile, encoding="utf-8") as f:
+            summary = json.load(f)
+    else:
+        slow_ms = args.slow_ms if args.slow_ms is not None else profiling.profiler.slow_ms
+        summary = profile_workload(slow_ms)
+    print()
+    print(profiling.format_summary(summary))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n✅ Summary written to {args.json}")
+
 
 if __name__ == "__main__":
     main()
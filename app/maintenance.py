@@ -0,0 +1,66 @@
+# app/maintenance.py
+"""
+Database upkeep for cron or a scheduled task, not for the GUI: it needs
+CREATE rights on the schema and takes locks on `transactions`.
+
+    finance-tracker-maintenance partitions [--months 3]
+    finance-tracker-maintenance compact [--keep-days 30]
+
+`partitions` creates the monthly partitions of `transactions` from this month
+to --months ahead (and moves any month that landed in the DEFAULT partition
+to its own). Run it at least monthly; the GUI only warns when they are missing.
+
+`compact` trims transaction_changes (app.db.compact_changes): it drops
+superseded entries and forgets changes older than --keep-days. A consumer
+that last synced before that (e.g. a replica not opened for a month) gets a
+reset and reloads; every other one keeps following changes incrementally.
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from .db import compact_changes, ensure_partitions, get_engine
+from .models import TransactionChange
+
+
+def _months_ahead(months: int) -> date:
+    today = date.today()
+    month = today.month - 1 + months
+    return date(today.year + month // 12, month % 12 + 1, 1)
+
+
+def partitions(conn, months: int) -> int:
+    return ensure_partitions(conn, date.today(), _months_ahead(months))
+
+
+def compact(conn, keep_days: int) -> int:
+    # the newest version older than the retention window (None: nothing is)
+    keep_after = conn.scalar(
+        select(func.max(TransactionChange.version))
+        .where(TransactionChange.changed_at < func.now() - timedelta(days=keep_days))
+    )
+    return compact_changes(conn, keep_after=keep_after)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Database upkeep (partitions, change log).")
+    sub = ap.add_subparsers(dest="task", required=True)
+    p = sub.add_parser("partitions", help="create the coming months' transactions partitions")
+    p.add_argument("--months", type=int, default=3, help="how many months ahead (default 3)")
+    p = sub.add_parser("compact", help="trim the transaction change log")
+    p.add_argument("--keep-days", type=int, default=30, help="keep the changes of the last N days (default 30)")
+    args = ap.parse_args()
+
+    with get_engine().begin() as conn:
+        if args.task == "partitions":
+            n = partitions(conn, args.months)
+            print(f"✅ Created {n} partitions", file=sys.stderr)
+        else:
+            n = compact(conn, args.keep_days)
+            print(f"✅ Removed {n} change-log entries", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
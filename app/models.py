@@ -1,9 +1,9 @@
 from __future__ import annotations
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import String, Integer, Date, Numeric, ForeignKey
+from sqlalchemy import String, Integer, BigInteger, Date, DateTime, Numeric, ForeignKey
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -34,3 +34,19 @@ class Transaction(Base):
     account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
     notes: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
+
+class BalanceCheckpoint(Base):
+    """Closing balance of an account at the end of `month` (income - expense so far)."""
+    __tablename__ = "account_balance_checkpoints"
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day of the month
+    balance: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+
+
+class TransactionChange(Base):
+    """One logged write to transactions (rows are written by database triggers)."""
+    __tablename__ = "transaction_changes"
+    version: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    op: Mapped[str] = mapped_column(String(1), nullable=False)  # 'I' | 'U' | 'D' | 'T' (truncate/reset)
+    tx_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
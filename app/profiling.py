@@ -0,0 +1,248 @@
+# app/profiling.py
+"""
+Opt-in query profiling on top of SQLAlchemy engine events.
+
+When enabled, every statement an engine runs is recorded under its
+fingerprint (the SQL with literals and parameters replaced by `?`) with its
+duration, row count and the UI action it ran for. Statements slower than the
+threshold also go to a slow-query log (kept in memory and logged as warnings).
+
+Enable it for the GUI with FINANCE_PROFILE=1 (the summary is written as JSON
+when the window closes), or inspect it with `finance-tracker-checkdb --profile`.
+
+    FINANCE_PROFILE=1          record queries
+    FINANCE_SLOW_MS=100        slow-query threshold in milliseconds
+    FINANCE_PROFILE_OUT=x.json where the GUI writes its session summary
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import pathlib
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, NamedTuple
+
+from sqlalchemy import event
+
+log = logging.getLogger(__name__)
+
+SLOW_MS = 100.0
+SLOW_LOG_SIZE = 200
+
+# The UI action statements are attributed to. JobRunner copies the context
+# into its workers, so an action set around submit() follows the job.
+current_action: contextvars.ContextVar[str] = contextvars.ContextVar("current_action", default="-")
+
+
+@contextlib.contextmanager
+def action(name: str):
+    """Attribute statements run (or jobs submitted) inside the block to `name`."""
+    token = current_action.set(name)
+    try:
+        yield
+    finally:
+        current_action.reset(token)
+
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                 # string literals
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+\b"), "?"),  # bound parameters
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),               # numbers
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),  # IN / VALUES lists
+    (re.compile(r"\s+"), " "),
+]
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """The statement with literals/parameters replaced, for grouping."""
+    for pattern, repl in _LITERALS:
+        statement = pattern.sub(repl, statement)
+    return statement.strip()
+
+
+class SlowQuery(NamedTuple):
+    at: float          # time.time() when it finished
+    duration_ms: float
+    rows: int | None
+    action: str
+    statement: str
+
+
+class QueryStats:
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "errors", "actions")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.actions: dict[str, int] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "errors": self.errors,
+            "actions": dict(self.actions),
+        }
+
+
+class QueryProfiler:
+    def __init__(self, slow_ms: float | Callable[[], float] = SLOW_MS, slow_log_size: int = SLOW_LOG_SIZE):
+        # a callable threshold is resolved on first use (see _slow_ms_from_env)
+        self._slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._engines: list = []
+        self.started = time.time()
+        self.stats: dict[str, QueryStats] = {}
+        self.slow: deque[SlowQuery] = deque(maxlen=slow_log_size)
+
+    @property
+    def slow_ms(self) -> float:
+        if callable(self._slow_ms):
+            self._slow_ms = self._slow_ms()
+        return self._slow_ms
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._engines)
+
+    def enable(self, engine) -> None:
+        """Start recording the statements of `engine` (idempotent)."""
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+        self._engines.append(engine)
+
+    def disable(self) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before)
+            event.remove(engine, "after_cursor_execute", self._after)
+            event.remove(engine, "handle_error", self._error)
+        self._engines.clear()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.stats.clear()
+            self.slow.clear()
+
+    # ---------- engine events ----------
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["profile_start"].pop()) * 1000
+        rows = cursor.rowcount if cursor.rowcount >= 0 else None  # -1: server-side cursor
+        self._record(statement, elapsed_ms, rows)
+
+    def _error(self, ctx):
+        starts = ctx.connection.info.get("profile_start") if ctx.connection is not None else None
+        if starts:
+            elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+            self._record(ctx.statement or "", elapsed_ms, None, failed=True)
+
+    def _record(self, statement: str, elapsed_ms: float, rows: int | None, failed: bool = False):
+        fp = fingerprint(statement)
+        act = current_action.get()
+        with self._lock:
+            st = self.stats.get(fp)
+            if st is None:
+                st = self.stats[fp] = QueryStats()
+            st.count += 1
+            st.total_ms += elapsed_ms
+            st.max_ms = max(st.max_ms, elapsed_ms)
+            st.rows += rows or 0
+            st.errors += failed
+            st.actions[act] = st.actions.get(act, 0) + 1
+            if elapsed_ms >= self.slow_ms:
+                self.slow.append(SlowQuery(time.time(), elapsed_ms, rows, act, fp))
+        if elapsed_ms >= self.slow_ms:
+            log.warning("slow query (%.1f ms, %s rows, action=%s): %s", elapsed_ms, rows, act, fp)
+
+    # ---------- reporting ----------
+    def summary(self) -> dict:
+        """JSON-ready session summary, statements by total time (largest first)."""
+        with self._lock:
+            stats = sorted(self.stats.items(), key=lambda kv: kv[1].total_ms, reverse=True)
+            statements = [{"fingerprint": fp, **st.as_dict()} for fp, st in stats]
+            slow = [q._asdict() for q in self.slow]
+        return {
+            "started": self.started,
+            "duration_s": round(time.time() - self.started, 3),
+            "slow_ms": self.slow_ms,
+            "statements": statements,
+            "slow_queries": slow,
+        }
+
+    def save(self, path: os.PathLike | str, **extra) -> pathlib.Path:
+        """Write summary() as JSON, with `extra` keys added (e.g. pool=...)."""
+        path = pathlib.Path(path)
+        path.write_text(json.dumps({**self.summary(), **extra}, indent=2), encoding="utf-8")
+        return path
+
+
+def format_summary(summary: dict, top: int = 20) -> str:
+    """Plain-text report of a summary() dict."""
+    lines = [
+        f"{'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>9}  statement",
+    ]
+    for st in summary["statements"][:top]:
+        lines.append(
+            f"{st['count']:>7} {st['total_ms']:>10.1f} {st['mean_ms']:>9.2f} {st['max_ms']:>9.2f} "
+            f"{st['rows']:>9}  {st['fingerprint'][:110]}"
+        )
+        lines.append(" " * 49 + "actions: " + ", ".join(f"{a}×{n}" for a, n in st["actions"].items()))
+    more = len(summary["statements"]) - top
+    if more > 0:
+        lines.append(f"… and {more} more statements")
+    slow = summary["slow_queries"]
+    lines.append(f"\nSlow queries (>= {summary['slow_ms']:g} ms): {len(slow)}")
+    for q in slow[-top:]:
+        lines.append(f"  {q['duration_ms']:>9.1f} ms  [{q['action']}]  {q['statement'][:110]}")
+    pool = summary.get("pool")
+    if pool:
+        mean = pool["wait_ms_total"] / pool["checkouts"] if pool["checkouts"] else 0.0
+        lines.append(
+            f"\nConnection pool: {pool['checkouts']} checkouts, wait mean {mean:.2f} ms / "
+            f"max {pool['wait_ms_max']:.2f} ms, {pool['timeouts']} timeouts, "
+            f"{pool['overflow']} overflow (size {pool['pool_size']})"
+        )
+        lines.append("  checkouts: " + ", ".join(f"{a}×{n}" for a, n in pool["checkouts_by_action"].items()))
+    return "\n".join(lines)
+
+
+def _slow_ms_from_env() -> float:
+    # read on first use, not at import: .env is only loaded then (app.db.load_env)
+    from .db import load_env
+
+    load_env()
+    return float(os.getenv("FINANCE_SLOW_MS", SLOW_MS))
+
+
+profiler = QueryProfiler(slow_ms=_slow_ms_from_env)
+
+
+def enabled_from_env() -> bool:
+    return os.getenv("FINANCE_PROFILE", "").lower() in ("1", "true", "yes", "on")
+
+
+def session_path() -> pathlib.Path:
+    """FINANCE_PROFILE_OUT, or exports/profile_<timestamp>.json under the repo root."""
+    if os.getenv("FINANCE_PROFILE_OUT"):
+        return pathlib.Path(os.environ["FINANCE_PROFILE_OUT"])
+    outdir = pathlib.Path(__file__).resolve().parents[1] / "exports"
+    outdir.mkdir(exist_ok=True)
+    return outdir / f"profile_{time.strftime('%Y%m%d_%H%M%S')}.json"
@@ -0,0 +1,123 @@
+# app/refdata.py
+"""
+Process-wide cache of the account/category reference data.
+
+Both lookup tables are loaded with a single query the first time any view is
+needed and then served from memory, so filter refreshes, dialogs and the
+table no longer query them again. The cache is dropped:
+- explicitly, with refdata.invalidate();
+- automatically, after any session commits changes to Account/Category;
+- optionally, after REFDATA_TTL seconds (for writes made by other processes).
+"""
+import os
+import threading
+import time
+from typing import Callable, NamedTuple
+
+from sqlalchemy import event, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from .models import Account, Category
+from .replica import read_session
+
+
+class _Snapshot(NamedTuple):
+    account_names: dict[int, str]            # id -> name
+    account_ids: dict[str, int]              # name -> id
+    category_names: dict[int, str]
+    category_ids: dict[str, int]
+    categories_by_type: dict[str, list[tuple[int, str]]]  # type -> [(id, name)] by name
+
+
+class ReferenceData:
+    def __init__(self, ttl: float | None | Callable[[], float | None] = None):
+        # a callable ttl is resolved on the first load (see _ttl_from_env)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot: _Snapshot | None = None
+        self._loaded_at = 0.0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def _get(self) -> _Snapshot:
+        with self._lock:
+            if self._snapshot is None or (
+                self.ttl is not None and time.monotonic() - self._loaded_at > self.ttl
+            ):
+                self._snapshot = self._load()
+                self._loaded_at = time.monotonic()
+                if callable(self.ttl):
+                    self.ttl = self.ttl()
+            return self._snapshot
+
+    @staticmethod
+    def _load() -> _Snapshot:
+        stmt = union_all(
+            select(literal("account"), Account.id, Account.name, null()),
+            select(literal("category"), Category.id, Category.name, Category.type),
+        )
+        with read_session() as s:
+            rows = s.execute(stmt).all()
+
+        accounts = sorted((name, _id) for kind, _id, name, _ in rows if kind == "account")
+        categories = sorted((name, _id, typ) for kind, _id, name, typ in rows if kind == "category")
+        by_type: dict[str, list[tuple[int, str]]] = {}
+        for name, _id, typ in categories:
+            by_type.setdefault(typ, []).append((_id, name))
+
+        return _Snapshot(
+            account_names={_id: name for name, _id in accounts},
+            account_ids={name: _id for name, _id in accounts},
+            category_names={_id: name for name, _id, _ in categories},
+            category_ids={name: _id for name, _id, _ in categories},
+            categories_by_type=by_type,
+        )
+
+    # ---------- views ----------
+    def account_names(self) -> dict[int, str]:
+        """id -> name, in name order."""
+        return self._get().account_names
+
+    def category_names(self) -> dict[int, str]:
+        """id -> name, in name order."""
+        return self._get().category_names
+
+    def account_id(self, name: str | None) -> int | None:
+        return self._get().account_ids.get(name) if name else None
+
+    def category_id(self, name: str | None) -> int | None:
+        return self._get().category_ids.get(name) if name else None
+
+    def categories_of_type(self, typ: str) -> list[tuple[int, str]]:
+        """[(id, name), ...] of the categories of `typ`, in name order."""
+        return self._get().categories_by_type.get(typ, [])
+
+
+def _ttl_from_env() -> float | None:
+    # read after the first load, which has brought in .env (app.db.load_env)
+    ttl = os.getenv("REFDATA_TTL")
+    return float(ttl) if ttl else None
+
+
+refdata = ReferenceData(ttl=_ttl_from_env)
+
+
+# ---------- invalidation on ORM writes ----------
+@event.listens_for(Session, "after_flush")
+def _mark_reference_writes(session, flush_context):
+    touched = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, (Account, Category)) for obj in touched):
+        session.info["refdata_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("refdata_dirty", False):
+        refdata.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session):
+    session.info.pop("refdata_dirty", None)
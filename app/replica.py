@@ -0,0 +1,271 @@
+# app/replica.py
+"""
+Optional local SQLite read replica.
+
+With FINANCE_REPLICA=<path> the GUI serves its reads (the table, filter
+options, dashboard) from a SQLite copy of accounts, categories,
+transactions and the balance checkpoints, so a warm start and every filter
+change work without a round trip to PostgreSQL. Writes still go to
+PostgreSQL; the replica then catches up:
+
+- the first sync copies everything, in one REPEATABLE READ snapshot;
+- later syncs ask transaction_changes for what changed since the stored
+  change version and copy just those rows by id (plus the small tables
+  whose data version moved). Nothing changed costs one query;
+- a reset in the change log (TRUNCATE, compaction past our version)
+  falls back to a full copy.
+
+Sessions that commit to PostgreSQL queue a sync on a background thread
+(request_sync); until it has run, reads go to PostgreSQL, so the app always
+sees its own writes. The GUI also syncs at startup and every
+FINANCE_REPLICA_SYNC_S seconds (default 30).
+"""
+import contextlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
+
+from sqlalchemy import BigInteger, Column, MetaData, String, Table, create_engine, delete, event, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from .db import SessionLocal, change_version, changes_since, get_engine, load_env, unit_of_work
+from .models import Account, BalanceCheckpoint, Category, Transaction
+
+log = logging.getLogger(__name__)
+
+COPY_CHUNK = 10_000
+SYNC_INTERVAL_S = 30.0
+
+_local = MetaData()
+# mirrors PostgreSQL's data_versions, so app.db.data_version() works on both
+data_versions = Table(
+    "data_versions", _local,
+    Column("name", String(63), primary_key=True),
+    Column("version", BigInteger, nullable=False),
+)
+replica_state = Table(
+    "replica_state", _local,
+    Column("key", String(63), primary_key=True),
+    Column("value", BigInteger, nullable=False),
+)
+# the same keyset-order indexes as PostgreSQL (see transactions_filter_indexes)
+INDEXES = {
+    "ix_transactions_date_id": "date DESC, id DESC",
+    "ix_transactions_type_date_id": "type, date DESC, id DESC",
+    "ix_transactions_category_date_id": "category_id, date DESC, id DESC",
+    "ix_transactions_account_date_id": "account_id, date DESC, id DESC",
+}
+SMALL_TABLES = {"accounts": Account, "categories": Category}
+
+
+# ---------- notes search on SQLite (see app.db.notes_fts_match) ----------
+def _words(notes: str | None) -> list[str]:
+    return re.findall(r"\w+", (notes or "").lower())
+
+
+def _terms(tsquery: str) -> list[str]:
+    # "groc:* & mark:*" (app.db.prefix_tsquery) -> ["groc", "mark"]
+    return [t[:-2] if t.endswith(":*") else t for t in tsquery.split(" & ") if t]
+
+
+def _fts_match(notes, tsquery) -> int:
+    words = _words(notes)
+    return int(all(any(w.startswith(t) for w in words) for t in _terms(tsquery)))
+
+
+def _fts_rank(notes, tsquery) -> float:
+    words = _words(notes)
+    hits = sum(any(w.startswith(t) for t in _terms(tsquery)) for w in words)
+    return hits / (len(words) + 1)
+
+
+def _on_connect(dbapi_conn, _record):
+    dbapi_conn.create_function("notes_fts_match", 2, _fts_match, deterministic=True)
+    dbapi_conn.create_function("notes_fts_rank", 2, _fts_rank, deterministic=True)
+    dbapi_conn.execute("PRAGMA journal_mode=WAL")  # readers do not wait for a sync
+    dbapi_conn.execute("PRAGMA synchronous=NORMAL")
+
+
+class SyncResult(NamedTuple):
+    full: bool           # everything was copied again
+    transactions: int    # rows upserted or deleted
+    reference: bool      # accounts/categories changed (refdata must reload)
+
+    @property
+    def changed(self) -> bool:
+        return self.full or self.transactions > 0 or self.reference
+
+
+class Replica:
+    def __init__(self, path: str, sync_interval_s: float = SYNC_INTERVAL_S):
+        self.path = path
+        self.sync_interval_s = sync_interval_s
+        self.engine = create_engine(
+            f"sqlite:///{path}", connect_args={"check_same_thread": False}, future=True
+        )
+        event.listen(self.engine, "connect", _on_connect)
+        self.Session = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False, future=True)
+        self._lock = threading.Lock()
+        self._ready: bool | None = None
+
+        tables = [Account.__table__, Category.__table__, Transaction.__table__,
+                  BalanceCheckpoint.__table__, data_versions, replica_state]
+        with self.engine.begin() as conn:
+            for table in tables:
+                table.create(conn, checkfirst=True)
+            for name, columns in INDEXES.items():
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON transactions ({columns})"))
+
+    @property
+    def ready(self) -> bool:
+        """True once a first sync has filled the replica."""
+        if not self._ready:
+            with self.engine.connect() as conn:
+                self._ready = self._change_version(conn) is not None
+        return self._ready
+
+    @staticmethod
+    def _change_version(conn) -> int | None:
+        return conn.scalar(select(replica_state.c.value).where(replica_state.c.key == "change_version"))
+
+    # ---------- sync ----------
+    def sync(self) -> SyncResult:
+        """Bring the replica up to date with PostgreSQL (see the module docstring)."""
+        with self._lock, get_engine().connect() as pg:
+            pg = pg.execution_options(isolation_level="REPEATABLE READ")
+            with pg.begin(), self.engine.begin() as local:
+                versions = select(data_versions.c.name, data_versions.c.version)
+                remote = dict(pg.execute(versions).all())
+                ours = dict(local.execute(versions).all())
+                since = self._change_version(local)
+                if since is not None and ours == remote:
+                    return SyncResult(False, 0, False)
+
+                changes = changes_since(pg, since) if since is not None else None
+                if changes is None or changes.reset:
+                    self._copy_all(pg, local)
+                    result = SyncResult(True, 0, True)
+                    version = change_version(pg)
+                else:
+                    n = self._apply(pg, local, changes)
+                    reference = [name for name in SMALL_TABLES if ours.get(name) != remote[name]]
+                    for name in reference:
+                        self._copy_table(pg, local, SMALL_TABLES[name].__table__)
+                    result = SyncResult(False, n, bool(reference))
+                    version = changes.version
+
+                if ours.get("transactions") != remote["transactions"]:
+                    self._copy_table(pg, local, BalanceCheckpoint.__table__)
+                self._save_versions(local, remote, version)
+        self._ready = True
+        return result
+
+    def _copy_table(self, pg, local, table) -> None:
+        local.execute(delete(table))
+        result = pg.execution_options(stream_results=True, yield_per=COPY_CHUNK).execute(select(table))
+        for chunk in result.partitions():
+            local.execute(insert(table), [row._asdict() for row in chunk])
+
+    def _copy_all(self, pg, local) -> None:
+        for table in (Account.__table__, Category.__table__, Transaction.__table__):
+            self._copy_table(pg, local, table)
+
+    def _apply(self, pg, local, changes) -> int:
+        tx = Transaction.__table__
+        for i in range(0, len(changes.deleted), COPY_CHUNK):
+            local.execute(delete(tx).where(tx.c.id.in_(changes.deleted[i:i + COPY_CHUNK])))
+        for i in range(0, len(changes.upserted), COPY_CHUNK):
+            ids = changes.upserted[i:i + COPY_CHUNK]
+            rows = pg.execute(select(tx).where(tx.c.id.in_(ids))).all()
+            # ids updated and then deleted since are simply not found
+            local.execute(delete(tx).where(tx.c.id.in_(ids)))
+            if rows:
+                local.execute(insert(tx), [row._asdict() for row in rows])
+        return len(changes.deleted) + len(changes.upserted)
+
+    @staticmethod
+    def _save_versions(local, remote: dict, version: int) -> None:
+        local.execute(delete(data_versions))
+        local.execute(insert(data_versions), [{"name": k, "version": v} for k, v in remote.items()])
+        local.execute(delete(replica_state))
+        local.execute(insert(replica_state), [{"key": "change_version", "value": version}])
+
+
+_replica: Replica | None = None
+_configured = False
+_replica_lock = threading.Lock()
+# syncs requested by this process's commits (request_sync)
+_sync_executor: ThreadPoolExecutor | None = None
+_sync_pending: Future | None = None
+_sync_lock = threading.Lock()
+
+
+def get_replica() -> Replica | None:
+    """The replica named by FINANCE_REPLICA (opened on the first call), or None."""
+    global _replica, _configured
+    with _replica_lock:
+        if not _configured:
+            load_env()
+            path = os.getenv("FINANCE_REPLICA")
+            if path:
+                interval = float(os.getenv("FINANCE_REPLICA_SYNC_S", SYNC_INTERVAL_S))
+                _replica = Replica(os.path.expanduser(path), interval)
+            _configured = True
+        return _replica
+
+
+@contextlib.contextmanager
+def read_session():
+    """
+    A session for reads: the replica once it is filled and has caught up
+    with this process's commits, else PostgreSQL (the current unit_of_work()
+    session, if any).
+    """
+    replica = get_replica()
+    pending = _sync_pending
+    # behind our own commits while a requested sync has not finished
+    if replica is not None and replica.ready and (pending is None or pending.done()):
+        with replica.Session() as s:
+            yield s
+    else:
+        with unit_of_work() as s:
+            yield s
+
+
+def sync_replica() -> SyncResult | None:
+    """Sync the replica if there is one; errors are logged, not raised."""
+    replica = get_replica()
+    if replica is None:
+        return None
+    try:
+        return replica.sync()
+    except Exception:
+        log.exception("replica sync failed")
+        return None
+
+
+def request_sync() -> Future | None:
+    """
+    Queue sync_replica() on the replica's own worker thread and return its
+    future (None without a replica). Requests made while a sync is still
+    waiting to start share it: it will see their commits.
+    """
+    global _sync_executor, _sync_pending
+    if get_replica() is None:
+        return None
+    with _sync_lock:
+        if _sync_pending is None or _sync_pending.running() or _sync_pending.done():
+            if _sync_executor is None:
+                _sync_executor = ThreadPoolExecutor(1, thread_name_prefix="replica-sync")
+            _sync_pending = _sync_executor.submit(sync_replica)
+        return _sync_pending
+
+
+# ---------- propagate this process's writes ----------
+@event.listens_for(SessionLocal, "after_commit")
+def _sync_after_commit(session):
+    # never sync inline: the commit may come from the Tk thread
+    request_sync()
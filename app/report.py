@@ -0,0 +1,226 @@
+# app/report.py
+"""
+Headless summary reports for scheduled runs.
+
+Each report is one GROUP BY query computed in the database and read back
+through a server-side cursor, then written row by row as CSV or JSON, so
+memory stays flat whatever the size of `transactions`. Nothing here imports
+Tk, matplotlib or pandas.
+
+    finance-tracker-report monthly --from 2024-01-01 --to 2024-12-31
+    finance-tracker-report category --format json -o categories.json
+    finance-tracker-report account --to 2024-12-31
+    finance-tracker-report monthly category account -o reports/
+
+Several reports are written to a directory, one file each; with asyncpg
+installed their queries run concurrently (app.db_async). That path buffers
+each report's rows before writing them: memory follows the size of the
+reports (one row per month, category or account), not of `transactions`.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from typing import Iterable, TextIO
+
+from sqlalchemy import and_, func, select
+
+from . import db_async
+from .balances import balance_on_expr
+from .db import get_engine, sum_by_type, transaction_filters
+from .models import Account, Category, Transaction
+
+FETCH_SIZE = 1000
+
+
+def _where(stmt, date_from: date | None, date_to: date | None):
+    where = transaction_filters(date_from=date_from, date_to=date_to)
+    return stmt.where(and_(*where)) if where else stmt
+
+
+def monthly_stmt(date_from: date | None = None, date_to: date | None = None):
+    """month, transactions, income, expense, net per calendar month (oldest first)."""
+    month = func.date_trunc("month", Transaction.date).label("month")
+    income, expense = sum_by_type("income"), sum_by_type("expense")
+    stmt = select(
+        func.to_char(month, "YYYY-MM").label("month"),
+        func.count().label("transactions"),
+        income.label("income"),
+        expense.label("expense"),
+        (income - expense).label("net"),
+    )
+    return _where(stmt, date_from, date_to).group_by(month).order_by(month)
+
+
+def category_stmt(date_from: date | None = None, date_to: date | None = None):
+    """category, type, transactions, total per category (largest total first)."""
+    total = func.sum(Transaction.amount)
+    stmt = (
+        select(
+            Category.name.label("category"),
+            Category.type.label("type"),
+            func.count().label("transactions"),
+            total.label("total"),
+        )
+        .join(Category, Category.id == Transaction.category_id)
+    )
+    return (
+        _where(stmt, date_from, date_to)
+        .group_by(Category.id, Category.name, Category.type)
+        .order_by(total.desc(), Category.name)
+    )
+
+
+def account_stmt(date_from: date | None = None, date_to: date | None = None):
+    """
+    account, transactions, income, expense, net within the range, and the
+    closing balance at date_to (all time, from the balance checkpoints).
+    Accounts without transactions in the range are included with zeros.
+    """
+    sums = _where(
+        select(
+            Transaction.account_id,
+            func.count().label("transactions"),
+            sum_by_type("income").label("income"),
+            sum_by_type("expense").label("expense"),
+        ),
+        date_from, date_to,
+    ).group_by(Transaction.account_id).subquery("sums")
+
+    income = func.coalesce(sums.c.income, 0)
+    expense = func.coalesce(sums.c.expense, 0)
+    return (
+        select(
+            Account.name.label("account"),
+            func.coalesce(sums.c.transactions, 0).label("transactions"),
+            income.label("income"),
+            expense.label("expense"),
+            (income - expense).label("net"),
+            balance_on_expr(Account.id, date_to).label("balance"),
+        )
+        .outerjoin(sums, sums.c.account_id == Account.id)
+        .order_by(Account.name)
+    )
+
+
+REPORTS = {
+    "monthly": monthly_stmt,
+    "category": category_stmt,
+    "account": account_stmt,
+}
+
+
+def stream_report(conn, report: str, date_from: date | None = None, date_to: date | None = None):
+    """(column names, row iterator) of `report`, fetched FETCH_SIZE rows at a time."""
+    result = conn.execution_options(stream_results=True, yield_per=FETCH_SIZE).execute(
+        REPORTS[report](date_from, date_to)
+    )
+    return list(result.keys()), iter(result)
+
+
+async def fetch_reports(reports: list[str], date_from: date | None = None, date_to: date | None = None):
+    """
+    {report: (column names, rows)}, the queries run concurrently (app.db_async).
+    The rows are read into lists; stream_report is the streaming path.
+    """
+    async def fetch(report, session):
+        result = await session.execute(REPORTS[report](date_from, date_to))
+        return list(result.keys()), result.all()
+
+    results = await db_async.fan_out(*(partial(fetch, r) for r in reports))
+    return dict(zip(reports, results))
+
+
+def _stream_reports(reports: list[str], date_from: date | None, date_to: date | None):
+    # one after another on one connection, when asyncpg is not installed
+    with get_engine().connect() as conn:
+        for report in reports:
+            yield report, stream_report(conn, report, date_from, date_to)
+
+
+# ---------- writers ----------
+def write_csv(out: TextIO, columns: list[str], rows: Iterable) -> int:
+    w = csv.writer(out)
+    w.writerow(columns)
+    n = 0
+    for row in rows:
+        w.writerow(row)
+        n += 1
+    return n
+
+
+def _json_value(value) -> str:
+    # Decimals are written as exact JSON numbers, not floats or strings
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return json.dumps(value.isoformat())
+    return json.dumps(value)
+
+
+def write_json(out: TextIO, columns: list[str], rows: Iterable) -> int:
+    """A JSON array of objects, written one row at a time."""
+    keys = [json.dumps(c) for c in columns]
+    n = 0
+    out.write("[")
+    for row in rows:
+        out.write(",\n " if n else "\n ")
+        out.write("{" + ", ".join(f"{k}: {_json_value(v)}" for k, v in zip(keys, row)) + "}")
+        n += 1
+    out.write("\n]\n" if n else "]\n")
+    return n
+
+
+WRITERS = {"csv": write_csv, "json": write_json}
+
+
+def _date(s: str) -> date:
+    try:
+        return date.fromisoformat(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {s!r}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Write monthly, category or account summaries.")
+    ap.add_argument("report", nargs="+", choices=REPORTS)
+    ap.add_argument("--from", dest="date_from", type=_date, metavar="YYYY-MM-DD")
+    ap.add_argument("--to", dest="date_to", type=_date, metavar="YYYY-MM-DD")
+    ap.add_argument("--format", choices=WRITERS, default="csv")
+    ap.add_argument("-o", "--output", help="file to write (default: stdout); a directory for several reports")
+    args = ap.parse_args()
+    reports = list(dict.fromkeys(args.report))
+
+    if len(reports) > 1:
+        if not args.output:
+            ap.error("several reports need -o DIRECTORY")
+        os.makedirs(args.output, exist_ok=True)
+        if db_async.available():
+            results = db_async.run(fetch_reports(reports, args.date_from, args.date_to)).items()
+        else:
+            results = _stream_reports(reports, args.date_from, args.date_to)
+        for report, (columns, rows) in results:
+            path = os.path.join(args.output, f"{report}.{args.format}")
+            with open(path, "w", newline="", encoding="utf-8") as out:
+                n = WRITERS[args.format](out, columns, rows)
+            print(f"✅ Wrote {n} rows to {path}", file=sys.stderr)
+        return
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        with get_engine().connect() as conn:
+            columns, rows = stream_report(conn, reports[0], args.date_from, args.date_to)
+            n = WRITERS[args.format](out, columns, rows)
+    finally:
+        if args.output:
+            out.close()
+    if args.output:
+        print(f"✅ Wrote {n} rows to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,258 @@
 # app/ui/dashboard_window.py
+import io
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import date
+from decimal import Decimal
+from functools import partial
+from typing import NamedTuple
 
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-from app.db import SessionLocal, get_transactions
-from app.models import Category
+from app import db_async
+from app.analytics import Analytics, compute, load_frame, load_frame_async
+from app.cache import ResultCache
+from app.db import data_version, get_totals, get_expense_by_category, unit_of_work
+from app.profiling import action
+from app.refdata import refdata
+from app.replica import get_replica, read_session
+from app.ui.jobs import JobRunner
 
 
-def _load_aggregates():
+def _default_window(date_from: date | None, date_to: date | None) -> tuple[date, date]:
+    if date_to is None:
+        date_to = date.today()
+    if date_from is None:
+        date_from = date(date_to.year - 1, date_to.month, 1)
+    return date_from, date_to
+
+
+def _load_aggregates(date_from: date | None = None, date_to: date | None = None):
     """
-    Load aggregates from the database for the last 12 months:
+    Load aggregates from the database (default window: last 12 months):
     - total income
     - total expense
     - net
     - expenses grouped by category (for pie chart)
+
+    Sums are computed with GROUP BY in the database and returned as Decimal.
     """
-    today = date.today()
-    year_ago = date(today.year - 1, today.month, 1)
+    date_from, date_to = _default_window(date_from, date_to)
 
-    with SessionLocal() as s:
-        rows = get_transactions(s, date_from=year_ago, date_to=today)
+    with read_session() as s:
+        total_income, total_expense = get_totals(s, date_from=date_from, date_to=date_to)
+        by_category = get_expense_by_category(s, date_from=date_from, date_to=date_to)
 
-        # Map category_id -> category_name
-        cat_rows = s.query(Category.id, Category.name).all()
-        cat_map = {cid: cname for cid, cname in cat_rows}
+    net = total_income - total_expense
 
-    total_income = 0.0
-    total_expense = 0.0
+    labels = [name for name, _ in by_category]
+    values = [value for _, value in by_category]
 
-    # expenses by category_id
-    expense_by_cat_id: dict[int, float] = {}
+    return total_income, total_expense, net, labels, values
 
-    for tx in rows:
-        amt = float(tx.amount)
 
-        if tx.type == "income":
-            total_income += amt
-        else:
-            total_expense += amt
-            if tx.category_id is not None:
-                expense_by_cat_id[tx.category_id] = (
-                    expense_by_cat_id.get(tx.category_id, 0.0) + amt
-                )
+HISTORY_YEARS = 5
+WEEKS_SHOWN = 26
+TOP_CATEGORIES = 6
 
-    net = total_income - total_expense
 
-    # Convert to labels/values using category names
-    labels: list[str] = []
-    values: list[float] = []
+def _load_analytics(date_to: date | None = None, years: int = HISTORY_YEARS) -> Analytics:
+    """Monthly/weekly series and category trends over the last `years` years."""
+    if date_to is None:
+        date_to = date.today()
+    date_from = date(date_to.year - years, date_to.month, 1)
 
-    for cid, value in expense_by_cat_id.items():
-        name = cat_map.get(cid, f"Category {cid}")
-        labels.append(name)
-        values.append(value)
+    with read_session() as s:
+        df = load_frame(s.connection(), date_from, date_to)
+    return compute(df, refdata.category_names(), date_from, date_to)
 
-    return total_income, total_expense, net, labels, values
+
+class Dashboard(NamedTuple):
+    total_income: Decimal
+    total_expense: Decimal
+    net: Decimal
+    charts: list[tuple[str, bytes]]  # (tab title, PNG image)
+
+
+# aggregates and rendered charts per date window, valid while the data version holds
+DASHBOARD_CACHE_SIZE = 8
+dashboard_cache = ResultCache(maxsize=DASHBOARD_CACHE_SIZE)
+
+
+def _load_dashboard(date_to: date | None = None) -> Dashboard:
+    """
+    Totals and rendered charts for the windows ending at date_to (today).
+    A repeat call with unchanged data costs one version lookup.
+    """
+    if date_to is None:
+        date_to = date.today()
+    # version check, aggregates, analytics and category names on one connection
+    with unit_of_work(), read_session() as s:
+        version = data_version(s)
+        return dashboard_cache.get_or_compute(
+            (date_to, HISTORY_YEARS), version, lambda: _build_dashboard(date_to)
+        )
+
+
+def _use_async() -> bool:
+    # the fan-out is for PostgreSQL; reads from the local replica stay synchronous
+    replica = get_replica()
+    return db_async.available() and not (replica is not None and replica.ready)
+
+
+def _load_concurrently(date_to: date):
+    """
+    _load_aggregates and _load_analytics with their four queries (totals,
+    expense by category, analytics frame, category names) run concurrently.
+    """
+    date_from, date_to = _default_window(None, date_to)
+    history_from = date(date_to.year - HISTORY_YEARS, date_to.month, 1)
+    (total_income, total_expense), by_category, df, names = db_async.run(db_async.fan_out(
+        partial(db_async.get_totals, date_from=date_from, date_to=date_to),
+        partial(db_async.get_expense_by_category, date_from=date_from, date_to=date_to),
+        partial(load_frame_async, date_from=history_from, date_to=date_to),
+        db_async.get_category_names,
+    ))
+    aggregates = (
+        total_income, total_expense, total_income - total_expense,
+        [name for name, _ in by_category], [value for _, value in by_category],
+    )
+    return aggregates, compute(df, names, history_from, date_to)
 
 
-def open_dashboard(master: tk.Misc) -> None:
+def _build_dashboard(date_to: date) -> Dashboard:
+    if _use_async():
+        aggregates, analytics = _load_concurrently(date_to)
+    else:
+        aggregates, analytics = _load_aggregates(date_to=date_to), _load_analytics(date_to)
+    total_income, total_expense, net, labels, values = aggregates
+    charts = [
+        ("By category", _render(_pie_figure(labels, values))),
+        ("Monthly trend", _render(_trend_figure(analytics))),
+        ("Weekly", _render(_weekly_figure(analytics))),
+        ("Category trends", _render(_category_figure(analytics))),
+    ]
+    return Dashboard(total_income, total_expense, net, charts)
+
+
+def open_dashboard(master: tk.Misc, jobs: JobRunner) -> None:
     """
-    Open a dashboard window with totals and a pie chart of expenses by category.
+    Open a dashboard window with totals, a pie chart of expenses by category
+    and trend charts. Everything loads (and the charts render) in the
+    background; the window opens once it arrives.
     """
-    try:
-        total_income, total_expense, net, labels, values = _load_aggregates()
-    except Exception as e:
-        messagebox.showerror("Dashboard", f"Could not load data:\n{e}")
-        return
+    with action("dashboard"):
+        jobs.submit(
+            _load_dashboard,
+            key="dashboard",
+            on_done=lambda result: _show_dashboard(master, result),
+            on_error=lambda e: messagebox.showerror("Dashboard", f"Could not load data:\n{e}"),
+        )
+
 
+def _render(fig: Figure) -> bytes:
+    """PNG of `fig`, drawn with Agg (safe off the Tk thread)."""
+    fig.tight_layout()
+    FigureCanvasAgg(fig)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def _embed(png: bytes, parent) -> None:
+    image = tk.PhotoImage(master=parent, data=png)
+    label = ttk.Label(parent, image=image, anchor="center")
+    label.image = image  # keep a reference, Tk does not
+    label.pack(fill="both", expand=True)
+
+
+def _pie_figure(labels, values) -> Figure:
+    """Share of each category in the window's expenses."""
+    fig = Figure(figsize=(7, 4))
+    ax = fig.add_subplot(111)
+
+    if values:
+        ax.pie(
+            [float(v) for v in values],
+            labels=labels,
+            autopct="%1.1f%%",
+            startangle=90,
+        )
+        ax.set_title("Expenses by category (last 12 months)")
+        ax.axis("equal")  # make it look like a circle
+    else:
+        ax.text(0.5, 0.5, "No expense data to display", ha="center", va="center")
+        ax.axis("off")
+    return fig
+
+
+def _trend_figure(analytics: Analytics) -> Figure:
+    """Monthly income / expense / net lines, with the rolling net dashed."""
+    fig = Figure(figsize=(7, 4))
+    ax = fig.add_subplot(111)
+    m = analytics.monthly
+    if m[["income", "expense"]].to_numpy().any():
+        ax.plot(m.index, m["income"], label="Income", color="tab:green")
+        ax.plot(m.index, m["expense"], label="Expense", color="tab:red")
+        ax.plot(m.index, m["net"], label="Net", color="tab:blue")
+        ax.plot(m.index, analytics.monthly_rolling["net"], label="Net (3-month avg)",
+                color="tab:blue", linestyle="--", alpha=0.6)
+        ax.axhline(0, color="grey", linewidth=0.8)
+        ax.set_title(f"Monthly totals (last {HISTORY_YEARS} years)")
+        ax.legend(loc="upper left", fontsize=8)
+        fig.autofmt_xdate()
+    else:
+        ax.text(0.5, 0.5, "No data to display", ha="center", va="center")
+        ax.axis("off")
+    return fig
+
+
+def _weekly_figure(analytics: Analytics) -> Figure:
+    """Net per week as bars, green above zero and red below."""
+    fig = Figure(figsize=(7, 4))
+    ax = fig.add_subplot(111)
+    w = analytics.weekly.tail(WEEKS_SHOWN)
+    if len(w):
+        colors = ["tab:green" if v >= 0 else "tab:red" for v in w["net"]]
+        ax.bar(w.index, w["net"], width=5, color=colors)
+        ax.axhline(0, color="grey", linewidth=0.8)
+        ax.set_title(f"Weekly net (last {WEEKS_SHOWN} weeks)")
+        fig.autofmt_xdate()
+    else:
+        ax.text(0.5, 0.5, "No data to display", ha="center", va="center")
+        ax.axis("off")
+    return fig
+
+
+def _category_figure(analytics: Analytics) -> Figure:
+    """Stacked monthly expense of the largest categories (the rest as Other)."""
+    fig = Figure(figsize=(7, 4))
+    ax = fig.add_subplot(111)
+    top = list(analytics.category_trends.index[:TOP_CATEGORIES])
+    monthly = analytics.category_monthly
+    if top:
+        bottom = None
+        labels = monthly.index.strftime("%b %y")
+        series = [(name, monthly[name]) for name in top]
+        rest = monthly.drop(columns=top).sum(axis=1)
+        if rest.any():
+            series.append(("Other", rest))
+        for name, values in series:
+            trend = analytics.category_trends["slope"].get(name)
+            label = f"{name} ({trend:+,.0f}/mo)" if trend is not None else name
+            ax.bar(labels, values, bottom=bottom, label=label)
+            bottom = values if bottom is None else bottom + values
+        ax.set_title("Expenses by category per month")
+        ax.legend(loc="upper left", fontsize=7)
+        ax.tick_params(axis="x", labelrotation=45, labelsize=8)
+    else:
+        ax.text(0.5, 0.5, "No expense data to display", ha="center", va="center")
+        ax.axis("off")
+    return fig
+
+
+def _show_dashboard(master: tk.Misc, dashboard: Dashboard) -> None:
     win = tk.Toplevel(master)
     win.title("Finance Dashboard")
     win.geometry("900x600")
@@ -108,33 +291,17 @@ def open_dashboard(master: tk.Misc) -> None:
             font=("Segoe UI", 12, "bold")
         ).pack(anchor="center")
 
-    card(summary, "Total Income", total_income)
-    card(summary, "Total Expense", total_expense)
-    card(summary, "Net", net)
-
-    # --- matplotlib figure: pie chart ---------------------------------------
-    fig = Figure(figsize=(7, 4))
-    ax = fig.add_subplot(111)
-
-    if values:
-        ax.pie(
-            values,
-            labels=labels,
-            autopct="%1.1f%%",
-            startangle=90,
-        )
-        ax.set_title("Expenses by category (last 12 months)")
-        ax.axis("equal")  # make it look like a circle
-    else:
-        ax.text(0.5, 0.5, "No expense data to display", ha="center", va="center")
-        ax.axis("off")
-
-    fig.tight_layout()
+    card(summary, "Total Income", dashboard.total_income)
+    card(summary, "Total Expense", dashboard.total_expense)
+    card(summary, "Net", dashboard.net)
 
-    canvas = FigureCanvasTkAgg(fig, master=container)
-    canvas.draw()
-    canvas_widget = canvas.get_tk_widget()
-    canvas_widget.pack(fill="both", expand=True)
+    # --- charts (pre-rendered images), one per tab ---------------------------
+    tabs = ttk.Notebook(container)
+    tabs.pack(fill="both", expand=True)
+    for title, png in dashboard.charts:
+        tab = ttk.Frame(tabs)
+        tabs.add(tab, text=title)
+        _embed(png, tab)
 
     # Close button
     ttk.Button(container, text="Close", command=win.destroy).pack(pady=(8, 0))
@@ -0,0 +1,108 @@
+# app/ui/jobs.py
+import contextvars
+import itertools
+import queue
+import sys
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from tkinter import messagebox
+from typing import Callable
+
+
+class JobRunner:
+    """
+    Runs blocking work (database queries) on a thread pool and delivers the
+    results back on the Tk thread, by polling a queue with after(). Callbacks
+    therefore may touch widgets; the work itself must not.
+
+    Jobs submitted with the same `key` supersede each other: the previous one
+    is cancelled if it has not started yet, and its result is dropped if it has.
+    Each job runs in a copy of the submitter's contextvars (e.g. the profiling
+    action), like asyncio tasks do.
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, root: tk.Misc, max_workers: int = 4,
+                 on_busy: Callable[[bool], None] | None = None):
+        self.root = root
+        self.on_busy = on_busy
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="finance-db")
+        self._inbox: queue.Queue = queue.Queue()
+        self._tokens = itertools.count(1)
+        self._latest: dict[str, tuple[int, Future]] = {}
+        self._pending = 0
+        root.after(self.POLL_MS, self._poll)
+
+    # ---------- public ----------
+    def submit(self, fn: Callable, *args, key: str | None = None,
+               on_done: Callable | None = None,
+               on_error: Callable[[BaseException], None] | None = None,
+               **kwargs) -> Future:
+        """Run fn(*args, **kwargs) on a worker; on_done(result) runs on the Tk thread."""
+        token = next(self._tokens)
+        if key is not None and key in self._latest:
+            self._latest[key][1].cancel()
+
+        ctx = contextvars.copy_context()
+        future = self._executor.submit(ctx.run, fn, *args, **kwargs)
+        if key is not None:
+            self._latest[key] = (token, future)
+        self._set_pending(+1)
+        future.add_done_callback(
+            lambda f: self._inbox.put((self._deliver, (key, token, f, on_done, on_error)))
+        )
+        return future
+
+    def post(self, fn: Callable, *args) -> None:
+        """Thread-safe: schedule fn(*args) on the Tk thread (e.g. progress updates)."""
+        self._inbox.put((fn, args))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- Tk side ----------
+    def _poll(self):
+        while True:
+            try:
+                fn, args = self._inbox.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception:
+                # e.g. a callback touching a widget destroyed meanwhile: report
+                # it like Tk does and keep delivering the other results
+                self.root.report_callback_exception(*sys.exc_info())
+        try:
+            if self.root.winfo_exists():
+                self.root.after(self.POLL_MS, self._poll)
+        except tk.TclError:
+            pass  # root destroyed
+
+    def _deliver(self, key, token, future: Future, on_done, on_error):
+        self._set_pending(-1)
+        if future.cancelled():
+            return
+        if key is not None:
+            if self._latest.get(key, (None,))[0] != token:
+                return  # superseded by a newer job with the same key
+            del self._latest[key]
+
+        exc = future.exception()
+        if exc is not None:
+            (on_error or self.report_error)(exc)
+        elif on_done is not None:
+            on_done(future.result())
+
+    def _set_pending(self, delta: int):
+        was_busy = self._pending > 0
+        self._pending += delta
+        if self.on_busy is not None and was_busy != (self._pending > 0):
+            # submit() runs on the Tk thread, completions are counted in _deliver
+            self.on_busy(self._pending > 0)
+
+    @staticmethod
+    def report_error(exc: BaseException):
+        """Default on_error: show the exception in an error box."""
+        messagebox.showerror("Database", f"❌ {exc}")
@@ -1,20 +1,25 @@
-import os
-import csv
-import time
-import pathlib
+import logging
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 
-from dotenv import load_dotenv
-from sqlalchemy import text, select
+from sqlalchemy import text
 
-from app.ui.dashboard_window import open_dashboard
-from app.db import engine, SessionLocal, get_transactions, delete_transaction
-from app.models import Category, Account, Transaction
+from app.ui.jobs import JobRunner
+from app.ui.transaction_table import TransactionTable
+from app.export import default_export_path, export
+from app.db import (get_engine, database_url, unit_of_work, pool_stats, format_pool_stats, get_transaction_rows, get_transaction_row, get_first_page,
+                    delete_transactions, update_transactions, missing_partitions, SEARCH_LIMIT)
+from app.refdata import refdata
+from app.replica import get_replica, read_session, sync_replica
+from app.profiling import action, profiler, session_path
+from app.models import Transaction
 
-load_dotenv()
+log = logging.getLogger(__name__)
+
+SEARCH_DEBOUNCE_MS = 300
 
 
 # ---------- tiny helpers ----------
@@ -24,34 +29,23 @@ def err(t, m):  messagebox.showerror(t, m)
 
 def test_db_connection():
     try:
-        with engine.connect() as c:
+        with get_engine().connect() as c:
             c.execute(text("SELECT 1"))
-        info("DB Test", "✅ Connected successfully!")
+        info("DB Test", f"✅ Connected successfully!\n\n{format_pool_stats(pool_stats())}")
     except Exception as e:
         err("DB Test", f"❌ Connection failed:\n{e}")
 
 
-def id_from_name(model, name: str | None):
-    if not name:
-        return None
-    with SessionLocal() as s:
-        row = s.execute(select(model.id).where(model.name == name)).first()
-        return row[0] if row else None
-
+def open_dashboard(root, jobs):
+    # matplotlib and pandas load on the first open, not at startup
+    from app.ui.dashboard_window import open_dashboard
 
-def maps(session):
-    # id -> name maps
-    acc = dict(session.execute(select(Account.id, Account.name)).all())
-    cat = dict(session.execute(select(Category.id, Category.name)).all())
-    return acc, cat
+    open_dashboard(root, jobs)
 
 
 def load_filter_options(cb_cat: ttk.Combobox, cb_acc: ttk.Combobox):
-    with SessionLocal() as s:
-        cats = [r[0] for r in s.execute(select(Category.name).order_by(Category.name)).all()]
-        accs = [r[0] for r in s.execute(select(Account.name).order_by(Account.name)).all()]
-    cb_cat["values"] = [""] + cats
-    cb_acc["values"] = [""] + accs
+    cb_cat["values"] = [""] + list(refdata.category_names().values())
+    cb_acc["values"] = [""] + list(refdata.account_names().values())
     cb_cat.set("")
     cb_acc.set("")
 
@@ -67,10 +61,18 @@ def parse_date(s: str | None):
 
 # ---------- dialog (add/edit) ----------
 class TransactionDialog(tk.Toplevel):
-    def __init__(self, master: tk.Misc, tx_id: int | None = None):
+    """
+    Add/edit form. After a successful save, `saved` is (tx_id, row) where row
+    is the projection row of the transaction if it matches `filters` (the
+    table's current filters), else None.
+    """
+
+    def __init__(self, master: tk.Misc, tx_id: int | None = None, filters: dict | None = None):
         super().__init__(master)
         
         self.tx_id = tx_id
+        self.filters = filters or {}
+        self.saved = None
         self.title("Edit Transaction" if tx_id else "Add Transaction")
         self.resizable(False, False)
         
@@ -123,8 +125,7 @@ class TransactionDialog(tk.Toplevel):
         self.after(50, lambda: self.focus_force())
 
     def load_accounts(self):
-        with SessionLocal() as s:
-            rows = s.execute(select(Account.id, Account.name).order_by(Account.name)).all()
+        rows = refdata.account_names().items()
         self._acc_map = {name: _id for (_id, name) in rows}
         names = [name for (_id, name) in rows]
         self.cmb_account["values"] = names
@@ -133,19 +134,14 @@ class TransactionDialog(tk.Toplevel):
 
     def load_categories(self):
         typ = self.var_type.get()
-        with SessionLocal() as s:
-            rows = s.execute(
-                select(Category.id, Category.name)
-                .where(Category.type == typ)
-                .order_by(Category.name)
-            ).all()
+        rows = refdata.categories_of_type(typ)
         self._cat_map = {name: _id for (_id, name) in rows}
         names = [name for (_id, name) in rows]
         self.cmb_category["values"] = names
         self.var_category.set(names[0] if names else "")
 
     def load_existing(self):
-        with SessionLocal() as s:
+        with action("edit"), unit_of_work() as s:
             tx = s.get(Transaction, self.tx_id)
             if not tx:
                 err("Error", f"Transaction {self.tx_id} not found.")
@@ -155,12 +151,12 @@ class TransactionDialog(tk.Toplevel):
             self.var_date.set(tx.date.isoformat())
             self.var_amount.set(str(float(tx.amount)))
             self.load_categories()
-            acc = s.execute(select(Account.name).where(Account.id == tx.account_id)).first()
-            cat = s.execute(select(Category.name).where(Category.id == tx.category_id)).first()
+            acc = refdata.account_names().get(tx.account_id)
+            cat = refdata.category_names().get(tx.category_id)
             if acc:
-                self.var_account.set(acc[0])
+                self.var_account.set(acc)
             if cat:
-                self.var_category.set(cat[0])
+                self.var_category.set(cat)
             self.txt_notes.insert(0, tx.notes or "")
 
     def on_save(self):
@@ -199,7 +195,7 @@ class TransactionDialog(tk.Toplevel):
 
         # --- DB write ---
         try:
-            with SessionLocal() as s:
+            with action("save"), unit_of_work() as s:
                 # cat_id calculado uma única vez, visível para if / else
                 cat_id = self._cat_map.get(cat_name)
 
@@ -214,18 +210,19 @@ class TransactionDialog(tk.Toplevel):
                     tx.category_id = cat_id  # type: ignore[assignment]
                     tx.notes = notes
                 else:
-                    s.add(
-                        Transaction(
-                            date=tx_date,
-                            amount=amt,
-                            type=typ,
-                            account_id=self._acc_map[acc_name],
-                            category_id=cat_id,  # type: ignore[arg-type]
-                            notes=notes,
-                        )
+                    tx = Transaction(
+                        date=tx_date,
+                        amount=amt,
+                        type=typ,
+                        account_id=self._acc_map[acc_name],
+                        category_id=cat_id,  # type: ignore[arg-type]
+                        notes=notes,
                     )
+                    s.add(tx)
 
                 s.commit()
+                # the row as the table shows it, so it can be placed without a reload
+                self.saved = (tx.id, get_transaction_row(s, tx.id, **self.filters))
 
             info("Success", "✅ Transaction saved!")
             self.destroy()
@@ -235,119 +232,337 @@ class TransactionDialog(tk.Toplevel):
 
 
 # ---------- listing / filters / export ----------
+def current_filters(cb_type=None, cb_cat=None, cb_acc=None, ent_from=None, ent_to=None, ent_search=None):
+    """Read the filter widgets into keyword arguments for the app.db query helpers."""
+    return dict(
+        tx_type=(cb_type.get().strip() or None) if cb_type else None,
+        category_id=refdata.category_id(cb_cat.get().strip()) if cb_cat else None,
+        account_id=refdata.account_id(cb_acc.get().strip()) if cb_acc else None,
+        date_from=parse_date(ent_from.get()) if ent_from else None,
+        date_to=parse_date(ent_to.get()) if ent_to else None,
+        notes_query=(ent_search.get().strip() or None) if ent_search else None,
+    )
+
+
 def filtered_rows(cb_type=None, cb_cat=None, cb_acc=None, ent_from=None, ent_to=None, ent_search=None):
-    tx_type = (cb_type.get().strip() or None) if cb_type else None
-    cat_id = id_from_name(Category, cb_cat.get().strip()) if cb_cat and cb_cat.get().strip() else None
-    acc_id = id_from_name(Account, cb_acc.get().strip()) if cb_acc and cb_acc.get().strip() else None
-    d_from = parse_date(ent_from.get()) if ent_from else None
-    d_to = parse_date(ent_to.get()) if ent_to else None
-    q = ent_search.get().strip() if ent_search else None
-
-    with SessionLocal() as s:
-        acc_map, cat_map = maps(s)
-        rows = get_transactions(
-            s,
-            tx_type=tx_type,
-            category_id=cat_id,
-            account_id=acc_id,
-            date_from=d_from,
-            date_to=d_to,
-            notes_query=q,
+    filters = current_filters(cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search)
+
+    with read_session() as s:
+        rows = get_transaction_rows(
+            s, ("id", "date", "type", "amount", "account_id", "category_id", "notes"), **filters
         )
-    return rows, acc_map, cat_map
+    return rows, refdata.account_names(), refdata.category_names()
+
+
+def check_partitions():
+    """
+    Warn when the upcoming monthly partitions are missing (read-only; they are
+    created by `finance-tracker-maintenance partitions`, see app.maintenance).
+    """
+    with unit_of_work() as s:
+        missing = missing_partitions(s)
+    if missing:
+        log.warning("missing transactions partitions (rows go to transactions_default): %s; "
+                    "run finance-tracker-maintenance partitions", ", ".join(missing))
+
 
+def format_totals(inc, exp) -> str:
+    return f"Totals — Income: {inc:.2f} | Expense: {exp:.2f} | Net: {(inc - exp):.2f}"
 
-def refresh_table(tree, cb_type=None, cb_cat=None, cb_acc=None,
+
+def refresh_table(table: TransactionTable, cb_type=None, cb_cat=None, cb_acc=None,
                   ent_from=None, ent_to=None, total_var: tk.StringVar | None = None,
                   ent_search=None):
-    for i in tree.get_children():
-        tree.delete(i)
-
-    rows, acc_map, cat_map = filtered_rows(cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search)
-    inc = exp = 0.0
-    for r in rows:
-        amt = float(r.amount)
-        inc += amt if r.type == "income" else 0.0
-        exp += amt if r.type == "expense" else 0.0
-        tree.insert(
-            "",
-            "end",
-            values=(
-                r.id,
-                r.date.isoformat(),
-                r.type,
-                f"{amt:.2f}",
-                acc_map.get(r.account_id, ""),
-                cat_map.get(r.category_id, ""),
-                (r.notes or "")[:80],
-            ),
-        )
+    filters = current_filters(cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search)
     if total_var is not None:
-        total_var.set(f"Totals — Income: {inc:.2f} | Expense: {exp:.2f} | Net: {(inc - exp):.2f}")
-
-
-def clear_filters(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
+        total_var.set("Totals — loading…")
+
+    # with search text the table shows the best full-text matches, not pages by date
+    ranked = bool(filters["notes_query"])
+    # one account and nothing but dates: show its running balance
+    ledger = filters["account_id"] is not None and not any(
+        filters[k] for k in ("tx_type", "category_id", "notes_query")
+    )
+
+    def fetch():
+        # first page + totals over all matching rows (not just the page) in one query
+        with read_session() as s:
+            limit = SEARCH_LIMIT if ranked else table.page_size + 1
+            return get_first_page(s, **filters, limit=limit, ranked=ranked, balance=ledger)
+
+    def show(result):
+        rows, inc, exp = result
+        table.load(filters, rows, paged=not ranked, totals=(inc, exp), ledger=ledger)
+        if total_var is not None:
+            total_var.set(format_totals(inc, exp))
+
+    # a newer refresh (filters changed again) drops this one's result
+    with action("refresh"):
+        table.jobs.submit(fetch, key="refresh", on_done=show)
+
+
+def apply_change(table: TransactionTable, change, total_var: tk.StringVar | None, reload):
+    """Show one (tx_id, row) change in the table, or call reload() when it cannot."""
+    if change is None:
+        return  # dialog cancelled
+    if not table.apply_change(*change):
+        return reload()
+    if total_var is not None and table.totals is not None:
+        total_var.set(format_totals(*table.totals))
+
+
+def clear_filters(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
     cb_type.set("")
     cb_cat.set("")
     cb_acc.set("")
     ent_from.delete(0, "end")
     ent_to.delete(0, "end")
     ent_search.delete(0, "end")
-    refresh_table(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+    refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
 
 
-def export_csv(cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search):
-    rows, acc_map, cat_map = filtered_rows(cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search)
-    project_root = pathlib.Path(__file__).resolve().parents[2]  # <repo root>
-    outdir = project_root / "exports"
-    outdir.mkdir(exist_ok=True)
-    path = outdir / f"transactions_{time.strftime('%Y%m%d_%H%M%S')}.csv"
-    try:
-        with path.open("w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["id", "date", "type", "amount", "account", "category", "notes"])
-            for r in rows:
-                w.writerow([
-                    r.id,
-                    r.date.isoformat(),
-                    r.type,
-                    f"{float(r.amount):.2f}",
-                    acc_map.get(r.account_id, ""),
-                    cat_map.get(r.category_id, ""),
-                    r.notes or "",
-                ])
-        info("Export CSV", f"✅ Exported {len(rows)} rows to:\n{path}")
-    except Exception as e:
-        err("Export CSV", f"❌ Failed to export:\n{e}")
+class ProgressDialog(tk.Toplevel):
+    """
+    Runs work(progress, cancel) through the job runner and shows its progress.
+    work returns the success message; cancelled runs close silently.
+    """
 
+    def __init__(self, master: tk.Misc, jobs: JobRunner, title: str, work, on_done=None):
+        super().__init__(master)
+        self.title(title)
+        self.resizable(False, False)
+        self.transient(master)  # type: ignore[arg-type]
+        self.protocol("WM_DELETE_WINDOW", self.on_cancel)
 
-def del_selected(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
-    sel = tree.selection()
-    if not sel:
+        self.cancel = threading.Event()
+        self.on_done = on_done
+
+        frm = ttk.Frame(self, padding=12)
+        frm.pack(fill="both", expand=True)
+        self.var_status = tk.StringVar(value="Starting…")
+        ttk.Label(frm, textvariable=self.var_status, width=40).pack(anchor="w")
+        bar = ttk.Progressbar(frm, mode="indeterminate", length=280)
+        bar.pack(fill="x", pady=(8, 8))
+        bar.start(15)
+        self.btn_cancel = ttk.Button(frm, text="Cancel", command=self.on_cancel)
+        self.btn_cancel.pack(anchor="e")
+
+        jobs.submit(
+            work, lambda n: jobs.post(self._progress, n), self.cancel,
+            on_done=self._done, on_error=self._failed,
+        )
+
+    def _progress(self, n: int):
+        self.var_status.set(f"Processed {n:,} rows…")
+
+    def _done(self, msg: str):
+        title = self.title()
+        self.destroy()
+        info(title, msg)
+        if self.on_done is not None:
+            self.on_done()
+
+    def _failed(self, exc: BaseException):
+        title = self.title()
+        self.destroy()
+        # ExportCancelled / ImportCancelled: the user asked for it, nothing to report
+        if not self.cancel.is_set():
+            err(title, f"❌ Failed:\n{exc}")
+
+    def on_cancel(self):
+        self.cancel.set()
+        self.var_status.set("Cancelling…")
+        self.btn_cancel.state(["disabled"])
+
+
+def export_file(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search):
+    filters = current_filters(cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search)
+    default = default_export_path("csv")
+    path = filedialog.asksaveasfilename(
+        parent=root, title="Export", initialdir=str(default.parent), initialfile=default.name,
+        defaultextension=".csv",
+        filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("Arrow files", "*.arrow")],
+    )
+    if not path:
+        return
+
+    def work(progress, cancel):
+        with unit_of_work() as s:
+            report = export(s, path, filters, progress=progress, cancel=cancel)
+        msg = f"✅ Exported {report.rows} rows to:\n{path}"
+        if report.size != report.csv_size:
+            msg += f"\n\n{report.size:,} bytes, {report.ratio:.1f}x smaller than CSV"
+        return msg
+
+    with action("export"):
+        ProgressDialog(root, table.jobs, "Export", work)
+
+
+def import_csv_file(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
+    path = filedialog.askopenfilename(
+        parent=root, title="Import CSV", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+    )
+    if not path:
+        return
+
+    def work(progress, cancel):
+        from app.importer import import_csv  # pandas loads on the first import, on this worker
+
+        with get_engine().begin() as conn:
+            report = import_csv(conn, path, progress=progress, cancel=cancel)
+        sync_replica()
+        msg = f"✅ Imported {report.inserted} rows."
+        if report.rejected:
+            lines = "\n".join(f"row {r}: {why}" for r, why in report.rejected[:10])
+            more = f"\n… and {len(report.rejected) - 10} more" if len(report.rejected) > 10 else ""
+            msg += f"\n\nRejected {len(report.rejected)} rows:\n{lines}{more}"
+        return msg
+
+    with action("import"):
+        ProgressDialog(
+            root, table.jobs, "Import CSV", work,
+            on_done=lambda: refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search),
+        )
+
+
+def selected_ids(table) -> list[int]:
+    return [int(table.tree.item(iid, "values")[0]) for iid in table.tree.selection()]
+
+
+def del_selected(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
+    ids = selected_ids(table)
+    if not ids:
         return info("Delete", "No transaction selected.")
-    tx_id = int(tree.item(sel[0], "values")[0])
-    if not messagebox.askyesno("Confirm", f"Delete transaction ID {tx_id}?"):
+    what = f"transaction ID {ids[0]}" if len(ids) == 1 else f"{len(ids)} transactions"
+    if not messagebox.askyesno("Confirm", f"Delete {what}?"):
         return
-    with SessionLocal() as s:
-        ok = delete_transaction(s, tx_id)
-    info("Delete", f"✅ Transaction {tx_id} deleted.") if ok else err("Delete", "❌ Could not delete.")
-    refresh_table(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
 
+    def work():
+        with unit_of_work() as s:
+            return delete_transactions(s, ids)
+
+    def reload():
+        refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+
+    def done(n):
+        if n:
+            info("Delete", f"✅ Deleted {what}." if n == len(ids) else f"✅ Deleted {n} of {len(ids)} transactions.")
+            # drop the rows in place; one reload when the table cannot
+            if all(table.apply_change(tx_id, None) for tx_id in ids):
+                if total_var is not None and table.totals is not None:
+                    total_var.set(format_totals(*table.totals))
+            else:
+                reload()
+        else:
+            err("Delete", "❌ Could not delete.")
+            reload()
 
-def open_add(root, tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
-    dlg = TransactionDialog(root)
+    with action("delete"):
+        table.jobs.submit(work, on_done=done)
+
+
+class BulkEditDialog(tk.Toplevel):
+    """
+    Moves the selected transactions to another category and/or account in
+    one UPDATE. A category is offered only when the selection has a single
+    type (categories are per type). `updated` is the row count after a save.
+    """
+
+    KEEP = "(unchanged)"
+
+    def __init__(self, master: tk.Misc, jobs: JobRunner, ids: list[int], types: set[str]):
+        super().__init__(master)
+        self.jobs = jobs
+        self.ids = ids
+        self.updated = None
+        self.title("Recategorize")
+        self.resizable(False, False)
+        self.transient(master)  # type: ignore[arg-type]
+        self.wait_visibility()
+        self.grab_set()
+
+        frm = ttk.Frame(self, padding=12)
+        frm.grid(row=0, column=0)
+        ttk.Label(frm, text=f"{len(ids)} selected transaction(s)").grid(row=0, column=0, columnspan=2, sticky="w")
+
+        rows = refdata.categories_of_type(next(iter(types))) if len(types) == 1 else []
+        self._cat_map = {name: _id for _id, name in rows}
+        self._acc_map = {name: _id for _id, name in refdata.account_names().items()}
+        self.var_category = tk.StringVar(value=self.KEEP)
+        self.var_account = tk.StringVar(value=self.KEEP)
+
+        ttk.Label(frm, text="Category").grid(row=1, column=0, sticky="w", padx=8, pady=6)
+        cmb_cat = ttk.Combobox(frm, textvariable=self.var_category, state="readonly",
+                               values=[self.KEEP, *self._cat_map])
+        cmb_cat.grid(row=1, column=1, padx=8, pady=6)
+        if not self._cat_map:
+            cmb_cat.state(["disabled"])  # mixed income and expense
+        ttk.Label(frm, text="Account").grid(row=2, column=0, sticky="w", padx=8, pady=6)
+        ttk.Combobox(frm, textvariable=self.var_account, state="readonly",
+                     values=[self.KEEP, *self._acc_map]).grid(row=2, column=1, padx=8, pady=6)
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=3, column=0, columnspan=2, sticky="e", pady=(10, 0))
+        ttk.Button(btns, text="Cancel", command=self.destroy).grid(row=0, column=0, padx=6)
+        self.btn_save = ttk.Button(btns, text="Save", command=self.on_save)
+        self.btn_save.grid(row=0, column=1)
+
+    def on_save(self):
+        category_id = self._cat_map.get(self.var_category.get())
+        account_id = self._acc_map.get(self.var_account.get())
+        if category_id is None and account_id is None:
+            return self.destroy()
+
+        def work():
+            with unit_of_work() as s:
+                return update_transactions(s, self.ids, category_id=category_id, account_id=account_id)
+
+        def done(n):
+            self.updated = n
+            self.destroy()
+
+        def failed(exc):
+            self.btn_save.state(["!disabled"])
+            err("Recategorize", f"❌ Could not update:\n{exc}")
+
+        self.btn_save.state(["disabled"])
+        with action("recategorize"):
+            self.jobs.submit(work, on_done=done, on_error=failed)
+
+
+def recategorize_selected(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
+    ids = selected_ids(table)
+    if not ids:
+        return info("Recategorize", "No transaction selected.")
+    types = {table.tree.item(iid, "values")[2] for iid in table.tree.selection()}
+    dlg = BulkEditDialog(root, table.jobs, ids, types)
     root.wait_window(dlg)
-    refresh_table(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+    if dlg.updated is not None:
+        # names, filters and ledger balances may all change: one reload
+        refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+        info("Recategorize", f"✅ Updated {dlg.updated} of {len(ids)} transactions.")
 
 
-def open_edit(root, tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
-    sel = tree.selection()
+def open_add(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
+    dlg = TransactionDialog(root, filters=table.filters)
+    root.wait_window(dlg)
+    apply_change(
+        table, dlg.saved, total_var,
+        lambda: refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search),
+    )
+
+
+def open_edit(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search):
+    sel = table.tree.selection()
     if not sel:
         return info("Edit", "No transaction selected.")
-    tx_id = int(tree.item(sel[0], "values")[0])
-    dlg = TransactionDialog(root, tx_id=tx_id)
+    tx_id = int(table.tree.item(sel[0], "values")[0])
+    dlg = TransactionDialog(root, tx_id=tx_id, filters=table.filters)
     root.wait_window(dlg)
-    refresh_table(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+    apply_change(
+        table, dlg.saved, total_var,
+        lambda: refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search),
+    )
 
 
 # ---------- main window ----------
@@ -366,6 +581,15 @@ def run():
     root.after(500, lambda: root.attributes("-topmost", False))
     root.resizable(True, True)
 
+    # DB work runs on background jobs; show a loading state while any is pending
+    busy_var = tk.StringVar(value="")
+
+    def on_busy(busy: bool):
+        busy_var.set("Loading…" if busy else "")
+        root.configure(cursor="watch" if busy else "")
+
+    jobs = JobRunner(root, on_busy=on_busy)
+
     container = ttk.Frame(root, padding=16)
     container.pack(fill="both", expand=True)
     ttk.Label(container, text="Personal Finance Tracker", font=("Segoe UI", 14, "bold")).pack(anchor="w")
@@ -375,7 +599,7 @@ def run():
     top = ttk.Frame(container)
     top.pack(fill="x", pady=(8, 0))
     ttk.Button(top, text="Test DB", command=test_db_connection).pack(side="left")
-    ttk.Button(top, text="Dashboard", command=lambda: open_dashboard(root)).pack(side="left", padx=8)
+    ttk.Button(top, text="Dashboard", command=lambda: open_dashboard(root, jobs)).pack(side="left", padx=8)
 
     # filters
     filters = ttk.Frame(container)
@@ -390,7 +614,6 @@ def run():
     ttk.Label(filters, text="Account").pack(side="left")
     cb_acc = ttk.Combobox(filters, width=18, state="readonly")
     cb_acc.pack(side="left", padx=(4, 12))
-    load_filter_options(cb_cat, cb_acc)
     ttk.Label(filters, text="From").pack(side="left", padx=(8, 4))
     ent_from = ttk.Entry(filters, width=12)
     ent_from.pack(side="left")
@@ -403,13 +626,16 @@ def run():
 
     # totals
     total_var = tk.StringVar(value="Totals — Income: 0.00 | Expense: 0.00 | Net: 0.00")
-    ttk.Label(container, textvariable=total_var, anchor="w").pack(fill="x", pady=(0, 4))
+    totals = ttk.Frame(container)
+    totals.pack(fill="x", pady=(0, 4))
+    ttk.Label(totals, textvariable=total_var, anchor="w").pack(side="left")
+    ttk.Label(totals, textvariable=busy_var, anchor="e").pack(side="right")
 
     # table
     table_frame = ttk.Frame(container)
     table_frame.pack(fill="both", expand=True, pady=(4, 8))
-    columns = ("id", "date", "type", "amount", "account", "category", "notes")
-    tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=14)
+    columns = ("id", "date", "type", "amount", "account", "category", "notes", "balance")
+    tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=14, selectmode="extended")
     for c in columns:
         tree.heading(c, text=c.title())
         tree.column(c, anchor="center", width=110 if c != "notes" else 300)
@@ -417,54 +643,118 @@ def run():
     tree.pack(side="left", fill="both", expand=True)
     sb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
     sb.pack(side="right", fill="y")
-    tree.configure(yscrollcommand=sb.set)
+    table = TransactionTable(tree, sb, jobs)
 
     # double click -> edit
-    tree.bind("<Double-1>", lambda e: open_edit(root, tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search))
+    tree.bind("<Double-1>", lambda e: open_edit(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search))
 
     # actions
     actions = ttk.Frame(container)
     actions.pack(fill="x", pady=(0, 10))
     ttk.Button(
         actions, text="Add",
-        command=lambda: open_add(root, tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+        command=lambda: open_add(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
     ).pack(side="left")
     ttk.Button(
         actions, text="Edit",
-        command=lambda: open_edit(root, tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+        command=lambda: open_edit(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
     ).pack(side="left", padx=8)
     ttk.Button(
         actions, text="Delete",
-        command=lambda: del_selected(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+        command=lambda: del_selected(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+    ).pack(side="left", padx=8)
+    ttk.Button(
+        actions, text="Recategorize…",
+        command=lambda: recategorize_selected(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
     ).pack(side="left", padx=8)
     ttk.Button(
         actions, text="Apply",
-        command=lambda: refresh_table(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+        command=lambda: refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
     ).pack(side="left", padx=8)
     ttk.Button(
         actions, text="Clear",
-        command=lambda: clear_filters(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+        command=lambda: clear_filters(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
     ).pack(side="left", padx=8)
     ttk.Button(
-        actions, text="Export CSV",
-        command=lambda: export_csv(cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search)
+        actions, text="Import CSV",
+        command=lambda: import_csv_file(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+    ).pack(side="left", padx=8)
+    ttk.Button(
+        actions, text="Export…",
+        command=lambda: export_file(root, table, cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search)
     ).pack(side="left", padx=8)
     ttk.Button(actions, text="Exit", command=root.destroy).pack(side="right")
 
     # status
+    status_var = tk.StringVar(value="Connected URL: …")
     ttk.Label(
         container,
-        text=f"Connected URL: {os.getenv('DATABASE_URL','(not set)')}",
+        textvariable=status_var,
         anchor="w",
         relief="groove"
     ).pack(fill="x", pady=(8, 0))
 
-    # initial + enter-to-apply (inclui Search)
-    refresh_table(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+    # enter-to-apply (inclui Search)
     for w in (cb_type, cb_cat, cb_acc, ent_from, ent_to, ent_search):
-        w.bind("<Return>", lambda e: refresh_table(tree, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search))
+        w.bind("<Return>", lambda e: refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search))
+
+    # search-as-you-type: refresh once typing pauses, and only if the text changed
+    search_state = {"after": None, "text": ""}
 
+    def search_now():
+        search_state["after"] = None
+        if ent_search.get() != search_state["text"]:
+            search_state["text"] = ent_search.get()
+            refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+
+    def on_search_key(_e):
+        if search_state["after"] is not None:
+            root.after_cancel(search_state["after"])
+        search_state["after"] = root.after(SEARCH_DEBOUNCE_MS, search_now)
+
+    ent_search.bind("<KeyRelease>", on_search_key)
+
+    # local replica: catch up in the background every sync_interval_s,
+    # refreshing only if something changed
+    def synced(result):
+        if result is None or not result.changed:
+            return
+        if result.reference:
+            refdata.invalidate()
+            load_filter_options(cb_cat, cb_acc)
+        refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+
+    def sync_done(result):
+        synced(result)
+        # the next sync is scheduled only once this one is done: a full copy can
+        # outlast the interval. get_replica() was opened by the sync, on a worker
+        replica = get_replica()
+        if replica is not None:
+            root.after(int(replica.sync_interval_s * 1000), sync_periodically)
+
+    def sync_periodically():
+        with action("replica-sync"):
+            jobs.submit(sync_replica, on_done=sync_done)
+
+    # everything that touches the database starts once the window is up: the
+    # first paint needs no .env, engine or query, and the rows arrive from jobs
+    def start():
+        status_var.set(f"Connected URL: {database_url()}")
+        refresh_table(table, cb_type, cb_cat, cb_acc, ent_from, ent_to, total_var, ent_search)
+        with action("filter-options"):
+            jobs.submit(refdata.account_names, on_done=lambda _: load_filter_options(cb_cat, cb_acc))
+        with action("partitions"):
+            jobs.submit(check_partitions,
+                        on_error=lambda exc: log.warning("partition check failed: %s", exc))
+        # with a warm replica the refresh above was served locally; now catch up
+        sync_periodically()
+
+    root.after_idle(start)
     root.mainloop()
+    jobs.shutdown()
+    if profiler.enabled:
+        path = profiler.save(session_path(), pool=pool_stats()._asdict())
+        print(f"Query profile written to {path}")
 
 
 if __name__ == "__main__":
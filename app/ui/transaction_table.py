@@ -0,0 +1,273 @@
+# app/ui/transaction_table.py
+from collections import deque
+from datetime import date
+from decimal import Decimal
+from tkinter import ttk
+
+from app.db import get_transactions_page, PAGE_SIZE
+from app.replica import read_session
+from app.profiling import action
+from app.ui.jobs import JobRunner
+
+
+class TransactionTable:
+    """
+    Treeview over a keyset-paginated transactions query.
+
+    Pages are fetched lazily as the user scrolls. At most `max_pages` pages
+    live in the widget: scrolling near the bottom appends the next page (and
+    drops the top one once the window is full), scrolling near the top brings
+    the dropped rows back. Memory and first paint do not depend on table size.
+    Page fetches run through `jobs`; a reload drops pages still in flight.
+    Single saved/deleted rows are applied in place with apply_change().
+
+    In ledger mode (one account, no other filter than dates) the last column
+    shows the account's running balance after each row, worked out from the
+    balance the first page carries and the amounts of the rows in between.
+    """
+
+    EDGE = 0.1  # fraction of the scroll range that triggers a fetch
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar, jobs: JobRunner,
+                 page_size: int = PAGE_SIZE, max_pages: int = 5):
+        self.tree = tree
+        self.jobs = jobs
+        self.scrollbar = scrollbar
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.filters: dict = {}
+        self.paged = True
+        self.ledger = False
+        self.totals: tuple[Decimal, Decimal] | None = None  # (income, expense) of all matches
+
+        self.keys: list[tuple] = []      # (date, id) of every row, display order
+        self.pages: deque[int] = deque()  # row count of each loaded page
+        self.has_before = False
+        self.has_after = False
+        self._pending = False
+        self._generation = 0
+
+        tree.configure(yscrollcommand=self._on_scroll)
+
+    # ---------- public ----------
+    def load(self, filters: dict, rows, paged: bool = True,
+             totals: tuple[Decimal, Decimal] | None = None, ledger: bool = False):
+        """
+        Reset the table to `filters`, showing `rows` as the first page
+        (fetched by the caller with limit=page_size + 1). With paged=False
+        the rows are a complete, already ordered result (e.g. ranked search
+        matches) and no further pages are fetched. `totals` are the
+        (income, expense) sums of every matching row, kept up to date by
+        apply_change(). With `ledger` the rows carry the balance after the
+        first one (get_first_page(..., balance=True)).
+        """
+        self.filters = filters
+        self.paged = paged
+        self.ledger = ledger and paged
+        self.totals = totals
+        self._generation += 1
+        self._pending = False
+        self.tree.delete(*self.tree.get_children())
+        self.keys.clear()
+        self.pages.clear()
+        self.has_before = False
+        self.has_after = False
+
+        if paged:
+            self._append(rows)
+        else:
+            for r in rows:
+                self._insert("end", r)
+            self.pages.append(len(rows))
+        self.tree.yview_moveto(0)
+
+    def apply_change(self, tx_id: int, row) -> bool:
+        """
+        Reflect one saved or deleted transaction without a reload: drop item
+        `tx_id` if it is shown, then insert `row` (its projection row if it
+        matches self.filters, None if it was deleted or no longer matches) at
+        its sorted position, adjusting self.totals by the amounts involved.
+        Returns False when rows cannot be placed here (ranked search results,
+        ordered by rank, or a ledger, whose balances below the change all
+        shift); the caller should reload instead.
+        """
+        if not self.paged or self.ledger:
+            return False
+
+        iid = str(tx_id)
+        if self.tree.exists(iid):
+            _, d, typ, amount, *_ = self.tree.item(iid, "values")
+            self._add_to_totals(typ, -Decimal(str(amount)))
+            self._remove(self._position((date.fromisoformat(str(d)), tx_id)))
+
+        if row is not None:
+            self._add_to_totals(row.type, row.amount)
+            index = self._position((row.date, row.id))
+            # rows sorting outside the loaded window appear when scrolled to
+            above = index == 0 and self.has_before
+            below = index == len(self.keys) and self.has_after
+            if not (above or below):
+                self._insert(index, row)
+                if not self.pages:
+                    self.pages.append(0)
+                self.pages[self._page_of(index)] += 1
+                self.tree.selection_set(iid)
+                self.tree.see(iid)
+        return True
+
+    def _position(self, key) -> int:
+        # binary search over the (date desc, id desc) keys: first index sorting at/after key
+        lo, hi = 0, len(self.keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.keys[mid] > key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _page_of(self, index: int) -> int:
+        # which loaded page holds display row `index` (the last one for the end)
+        end = 0
+        for p, n in enumerate(self.pages):
+            end += n
+            if index < end:
+                return p
+        return len(self.pages) - 1
+
+    def _remove(self, index: int):
+        self.tree.delete(str(self.keys[index][1]))
+        p = self._page_of(index)
+        del self.keys[index]
+        self.pages[p] -= 1
+        if not self.pages[p]:
+            del self.pages[p]
+
+    def _add_to_totals(self, typ: str, amount: Decimal):
+        if self.totals is None:
+            return
+        inc, exp = self.totals
+        self.totals = (inc + amount, exp) if typ == "income" else (inc, exp + amount)
+
+    # ---------- paging ----------
+    def _fetch(self, filters, after=None, before=None):
+        # runs on a worker thread
+        with read_session() as s:
+            return get_transactions_page(
+                s, **filters, after=after, before=before,
+                limit=self.page_size + 1,
+            )
+
+    def _fetch_async(self, add_rows, **seek):
+        generation = self._generation
+
+        def done(rows):
+            if generation == self._generation:
+                self._pending = False
+                add_rows(rows)
+
+        def failed(exc):
+            if generation == self._generation:
+                self._pending = False
+            self.jobs.report_error(exc)
+
+        with action("table-page"):
+            self.jobs.submit(self._fetch, self.filters, **seek, key="table-page",
+                             on_done=done, on_error=failed)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._pending:
+            return
+        first, last = float(first), float(last)
+        if last >= 1 - self.EDGE and self.has_after:
+            self._pending = True
+            self._fetch_async(self._append, after=self.keys[-1])
+        elif first <= self.EDGE and self.has_before:
+            self._pending = True
+            self._fetch_async(self._prepend, before=self.keys[0])
+
+    def _append(self, rows):
+        self.has_after = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if not rows:
+            return
+        balance = None
+        if self.ledger:
+            # balance after each row = balance after the row above - that row
+            if self.keys:
+                balance, signed = self._ledger_values(self.keys[-1][1])
+                balance -= signed
+            else:
+                balance = Decimal(rows[0].balance)
+        for r in rows:
+            self._insert("end", r, balance)
+            if balance is not None:
+                balance -= self._signed(r.type, r.amount)
+        self.pages.append(len(rows))
+
+        if len(self.pages) > self.max_pages:
+            n = self.pages.popleft()
+            self.tree.delete(*self.tree.get_children()[:n])
+            del self.keys[:n]
+            self.has_before = True
+            # rows above the view went away; keep the same rows on screen
+            self.tree.yview_scroll(-n, "units")
+
+    def _prepend(self, rows):
+        # `before` pages come back in display order, closest row last
+        self.has_before = len(rows) > self.page_size
+        rows = rows[-self.page_size:]
+        if not rows:
+            self.has_before = False
+            return
+        balances = [None] * len(rows)
+        if self.ledger:
+            # walk upwards: balance after a row = balance after the one below + its amount
+            balance, _ = self._ledger_values(self.keys[0][1])
+            for idx in range(len(rows) - 1, -1, -1):
+                balance += self._signed(rows[idx].type, rows[idx].amount)
+                balances[idx] = balance
+        for idx, r in enumerate(rows):
+            self._insert(idx, r, balances[idx])
+        self.pages.appendleft(len(rows))
+
+        if len(self.pages) > self.max_pages:
+            n = self.pages.pop()
+            self.tree.delete(*self.tree.get_children()[-n:])
+            del self.keys[-n:]
+            self.has_after = True
+        self.tree.yview_scroll(len(rows), "units")
+
+    @staticmethod
+    def _signed(typ: str, amount) -> Decimal:
+        amount = Decimal(str(amount))
+        return amount if typ == "income" else -amount
+
+    def _ledger_values(self, tx_id: int) -> tuple[Decimal, Decimal]:
+        # (running balance after item tx_id, its signed amount)
+        _, _, typ, amount, *_, balance = self.tree.item(str(tx_id), "values")
+        return Decimal(str(balance)), self._signed(typ, amount)
+
+    def _insert(self, index, r, balance: Decimal | None = None):
+        # r is a projection row (app.db.LIST_COLUMNS): names come joined from SQL
+        key = (r.date, r.id)
+        if index == "end":
+            self.keys.append(key)
+        else:
+            self.keys.insert(index, key)
+        self.tree.insert(
+            "",
+            index,
+            iid=str(r.id),
+            values=(
+                r.id,
+                r.date.isoformat(),
+                r.type,
+                f"{r.amount:.2f}",
+                r.account,
+                r.category,
+                (r.notes or "")[:80],
+                "" if balance is None else f"{balance:.2f}",
+            ),
+        )
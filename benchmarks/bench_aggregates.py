@@ -0,0 +1,70 @@
+# benchmarks/bench_aggregates.py
+"""
+Dashboard aggregates: ORM rows summed in Python vs GROUP BY in the database.
+
+    python -m benchmarks.bench_aggregates [--sizes 10000 100000 1000000]
+"""
+import argparse
+import math
+import time
+from datetime import date
+
+from benchmarks.synthetic import bench_engine, seed
+from app.db import SessionLocal, get_transactions
+from app.models import Category
+from app.ui.dashboard_window import _load_aggregates
+
+
+def legacy_aggregates(date_from: date, date_to: date):
+    """The pre-SQL dashboard path: load every row, sum floats in Python."""
+    with SessionLocal() as s:
+        rows = get_transactions(s, date_from=date_from, date_to=date_to)
+        cat_map = dict(s.query(Category.id, Category.name).all())
+
+    inc = exp = 0.0
+    by_cat: dict[int, float] = {}
+    for tx in rows:
+        amt = float(tx.amount)
+        if tx.type == "income":
+            inc += amt
+        else:
+            exp += amt
+            by_cat[tx.category_id] = by_cat.get(tx.category_id, 0.0) + amt
+    labels = [cat_map.get(cid, f"Category {cid}") for cid in by_cat]
+    return inc, exp, inc - exp, labels, list(by_cat.values())
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    engine = bench_engine()
+    today = date.today()
+    date_from = date(today.year - 1, today.month, 1)
+
+    print(f"{'rows':>10} {'python (s)':>12} {'sql (s)':>10} {'speedup':>9}")
+    for n in args.sizes:
+        seed(engine, n, days=(today - date_from).days + 1, end=today)
+
+        legacy = legacy_aggregates(date_from, today)
+        new = _load_aggregates(date_from, today)
+        assert math.isclose(float(new[2]), legacy[2], rel_tol=1e-9, abs_tol=0.01), "totals diverge"
+
+        t_old = best_of(lambda: legacy_aggregates(date_from, today), args.repeat)
+        t_new = best_of(lambda: _load_aggregates(date_from, today), args.repeat)
+        print(f"{n:>10} {t_old:>12.3f} {t_new:>10.3f} {t_old / t_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
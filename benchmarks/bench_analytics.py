@@ -0,0 +1,72 @@
+# benchmarks/bench_analytics.py
+"""
+Dashboard analytics: bulk COPY into pandas + vectorized series vs a
+row-by-row Python loop over projection rows.
+
+    python -m benchmarks.bench_analytics [--rows 1000000] [--years 5] [--no-seed]
+"""
+import argparse
+import math
+import time
+from datetime import date
+
+from benchmarks.synthetic import bench_engine, seed
+from app.analytics import compute, load_frame
+from app.db import engine, SessionLocal, get_transaction_rows
+from app.refdata import refdata
+
+
+def python_monthly(date_from: date, date_to: date) -> dict:
+    """Baseline: monthly income/expense summed in a Python loop."""
+    with SessionLocal() as s:
+        rows = get_transaction_rows(s, ("date", "type", "amount"), date_from=date_from, date_to=date_to)
+    months: dict[tuple[int, int], list[float]] = {}
+    for d, typ, amount in rows:
+        cell = months.setdefault((d.year, d.month), [0.0, 0.0])
+        cell[typ != "income"] += float(amount)
+    return months
+
+
+def best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-seed", action="store_true", help="reuse the current table contents")
+    args = ap.parse_args()
+
+    today = date.today()
+    date_from = date(today.year - args.years, today.month, 1)
+    if not args.no_seed:
+        seed(bench_engine(), args.rows, days=(today - date_from).days + 1, end=today)
+    names = refdata.category_names()
+
+    def load():
+        with engine.connect() as conn:
+            return load_frame(conn, date_from, today)
+
+    t_load, df = best_of(load, args.repeat)
+    t_compute, analytics = best_of(lambda: compute(df, names, date_from, today), args.repeat)
+    t_python, months = best_of(lambda: python_monthly(date_from, today), 1)
+
+    m = analytics.monthly
+    assert math.isclose(m["expense"].sum(), sum(e for _, e in months.values()), rel_tol=1e-9), "totals diverge"
+
+    print(f"{len(df):,} rows over {args.years} years")
+    print(f"  load (COPY -> DataFrame) {t_load:>8.3f} s")
+    print(f"  compute (all series)     {t_compute:>8.3f} s")
+    print(f"  total                    {t_load + t_compute:>8.3f} s")
+    print(f"  python loop, monthly only{t_python:>8.3f} s  ({t_python / (t_load + t_compute):.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
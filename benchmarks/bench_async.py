@@ -0,0 +1,63 @@
+# benchmarks/bench_async.py
+"""
+Dashboard data load: the sync helpers one query after another vs the
+app.db_async fan-out (totals, expense by category, analytics frame and
+category names concurrently, over asyncpg). Both sides start with warm
+connection pools; chart rendering is not included.
+
+    python -m benchmarks.bench_async [--rows 1000000] [--no-seed] [--repeat 10]
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+
+from benchmarks.synthetic import bench_engine, seed
+from app import db_async
+from app.refdata import refdata
+from app.ui.dashboard_window import HISTORY_YEARS, _load_aggregates, _load_analytics, _load_concurrently
+
+
+def load_sync(date_to: date):
+    refdata.invalidate()  # the fan-out reads the category names too
+    return _load_aggregates(date_to=date_to), _load_analytics(date_to)
+
+
+def timed(fn, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=10)
+    ap.add_argument("--no-seed", action="store_true", help="reuse the current table contents")
+    args = ap.parse_args()
+    if not db_async.available():
+        raise SystemExit("asyncpg is not installed (pip install .[async])")
+
+    today = date.today()
+    if not args.no_seed:
+        days = (today - date(today.year - HISTORY_YEARS, today.month, 1)).days + 1
+        seed(bench_engine(), args.rows, days=days, end=today)
+
+    # first call of each opens its pool; not counted
+    sync_result, async_result = load_sync(today), _load_concurrently(today)
+    assert sync_result[0] == async_result[0], "aggregates differ"
+
+    sync = timed(lambda: load_sync(today), args.repeat)
+    fan_out = timed(lambda: _load_concurrently(today), args.repeat)
+
+    print("dashboard data load" if args.no_seed else f"dashboard data load over {args.rows:,} rows")
+    for label, times in (("sync, sequential", sync), ("async fan-out", fan_out)):
+        print(f"  {label:<18} median {statistics.median(times) * 1000:>8.1f} ms   min {min(times) * 1000:>8.1f} ms")
+    print(f"  speedup            {statistics.median(sync) / statistics.median(fan_out):.2f}x (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_dashboard.py
+"""
+Dashboard open: cold (aggregates + analytics + chart rendering) vs a repeat
+open with unchanged data (version lookup + cache hit), and the first open
+after a write.
+
+    MPLBACKEND=Agg python -m benchmarks.bench_dashboard [--rows 1000000] [--no-seed]
+"""
+import argparse
+import time
+from datetime import date
+
+from sqlalchemy import text
+
+from benchmarks.synthetic import bench_engine, seed
+from app.db import engine
+from app.ui.dashboard_window import HISTORY_YEARS, _load_dashboard, dashboard_cache
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--no-seed", action="store_true", help="reuse the current table contents")
+    args = ap.parse_args()
+
+    today = date.today()
+    if not args.no_seed:
+        days = (today - date(today.year - HISTORY_YEARS, today.month, 1)).days + 1
+        seed(bench_engine(), args.rows, days=days, end=today)
+
+    dashboard_cache.clear()
+    cold = timed(_load_dashboard)
+    warm = min(timed(_load_dashboard) for _ in range(args.repeat))
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE transactions SET notes = notes WHERE id = (SELECT min(id) FROM transactions)"))
+    after_write = timed(_load_dashboard)
+
+    print("dashboard" if args.no_seed else f"dashboard over {args.rows:,} rows")
+    print(f"  cold open            {cold * 1000:>9.1f} ms")
+    print(f"  repeat, same data    {warm * 1000:>9.1f} ms  ({cold / warm:,.0f}x faster)")
+    print(f"  first after a write  {after_write * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
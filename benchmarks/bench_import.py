@@ -0,0 +1,48 @@
+# benchmarks/bench_import.py
+"""
+Bulk import throughput: export N synthetic rows to CSV, truncate, import them back.
+
+    python -m benchmarks.bench_import [--rows 1000000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from benchmarks.synthetic import bench_engine, seed
+from app.db import SessionLocal
+from app.export import write_csv
+from app.importer import import_csv
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    engine = bench_engine()
+    seed(engine, args.rows, days=3650)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.csv")
+        with SessionLocal() as s:
+            write_csv(s, path, {})
+        size_mb = os.path.getsize(path) / 1e6
+
+        with engine.begin() as conn:
+            conn.execute(text("TRUNCATE transactions RESTART IDENTITY"))
+
+        t0 = time.perf_counter()
+        with engine.begin() as conn:
+            report = import_csv(conn, path)
+        elapsed = time.perf_counter() - t0
+
+    assert report.inserted == args.rows and not report.rejected, report.rejected[:5]
+    print(f"imported {report.inserted:,} rows ({size_mb:,.0f} MB) in {elapsed:.2f}s "
+          f"-> {report.inserted / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_projection.py
+"""
+Listing rows: ORM Transaction entities vs read-only projection rows.
+
+Loads every row of the seeded table both ways and reports construction time
+and the memory retained per row (tracemalloc, measured while the list is
+still alive). The ORM path resolves names through refdata, as the UI used to;
+the projection path gets them joined from SQL.
+
+    python -m benchmarks.bench_projection [--rows 1000000] [--no-seed]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks.synthetic import bench_engine, seed
+from app.db import SessionLocal, get_transactions, get_transaction_rows, LIST_COLUMNS
+from app.refdata import refdata
+
+
+def orm_listing(s):
+    rows = get_transactions(s)
+    acc_map, cat_map = refdata.account_names(), refdata.category_names()
+    names = [(acc_map.get(r.account_id, ""), cat_map.get(r.category_id, "")) for r in rows]
+    return rows, names
+
+
+def projection_listing(s):
+    return get_transaction_rows(s, LIST_COLUMNS)
+
+
+def projection_ids_only(s):
+    return get_transaction_rows(s, ("id", "date", "type", "amount", "account_id", "category_id", "notes"))
+
+
+def measure(fn) -> tuple[float, int, int]:
+    """
+    (seconds, bytes retained, row count) for building fn's result. Time and
+    memory come from separate runs: tracemalloc slows allocation-heavy code.
+    """
+    refdata.account_names()  # keep the reference-data load out of the numbers
+    gc.collect()
+    with SessionLocal() as s:
+        t0 = time.perf_counter()
+        result = fn(s)
+        elapsed = time.perf_counter() - t0
+        n = len(result[0] if isinstance(result, tuple) else result)
+    del result
+    gc.collect()
+    with SessionLocal() as s:
+        tracemalloc.start()
+        result = fn(s)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    del result
+    return elapsed, retained, n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--no-seed", action="store_true", help="reuse the current table contents")
+    args = ap.parse_args()
+
+    engine = bench_engine()
+    if not args.no_seed:
+        seed(engine, args.rows, end=date.today())
+
+    cases = [
+        ("orm entities + refdata names", orm_listing),
+        ("projection, names from SQL", projection_listing),
+        ("projection, ids only", projection_ids_only),
+    ]
+    print(f"{'path':<30} {'rows':>9} {'time (s)':>9} {'bytes/row':>10}")
+    baseline = None
+    for label, fn in cases:
+        elapsed, retained, n = measure(fn)
+        per_row = retained / max(n, 1)
+        baseline = baseline or (elapsed, per_row)
+        print(f"{label:<30} {n:>9} {elapsed:>9.2f} {per_row:>10.0f}"
+              f"   ({baseline[0] / elapsed:.1f}x faster, {baseline[1] / per_row:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
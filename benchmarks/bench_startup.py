@@ -0,0 +1,129 @@
+# benchmarks/bench_startup.py
+"""
+GUI cold start, each sample in a fresh interpreter:
+- import time of app.ui.main_window (python -X importtime);
+- time to first paint (window mapped and drawn) and to the first rows of the
+  table, from process start. Needs a display and BENCH_DATABASE_URL.
+
+Exits non-zero when importing the main window pulls in a module that should
+only load on first use (matplotlib, pandas, pyarrow, python-dotenv, a DBAPI)
+or when the median import time is over --budget-ms.
+
+    python -m benchmarks.bench_startup [--repeat 5] [--budget-ms 600]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFERRED = ("matplotlib", "pandas", "numpy", "pyarrow", "dotenv", "psycopg2", "psycopg", "asyncpg")
+
+IMPORT_PROBE = f"""
+import sys
+import app.ui.main_window
+print(" ".join(m for m in {DEFERRED!r} if m in sys.modules))
+"""
+
+# runs the real main window, with mainloop replaced by: draw once, then pump
+# events until the table has rows
+PAINT_PROBE = """
+import time
+import tkinter as tk
+from tkinter import ttk
+
+
+def find_tree(widget):
+    if isinstance(widget, ttk.Treeview):
+        return widget
+    for child in widget.winfo_children():
+        found = find_tree(child)
+        if found is not None:
+            return found
+
+
+def mainloop(self, n=0):
+    self.update()
+    print("paint", time.time(), flush=True)
+    tree = find_tree(self)
+    deadline = time.monotonic() + 60
+    while not tree.get_children() and time.monotonic() < deadline:
+        self.update()
+        time.sleep(0.002)
+    if tree.get_children():
+        print("rows", time.time(), flush=True)
+    self.destroy()
+
+
+tk.Tk.mainloop = mainloop
+from app.ui.main_window import run
+run()
+"""
+
+
+def import_sample() -> tuple[float, list[str]]:
+    """(seconds to import app.ui.main_window, deferred modules it loaded)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    m = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| app\.ui\.main_window$", proc.stderr, re.M)
+    return int(m.group(1)) / 1e6, proc.stdout.split()
+
+
+def paint_sample() -> dict[str, float] | None:
+    """Seconds from spawn to first paint and to first rows; None without a display."""
+    t0 = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-c", PAINT_PROBE], cwd=ROOT, capture_output=True, text=True,
+    )
+    marks = dict(line.split() for line in proc.stdout.splitlines() if line.startswith(("paint", "rows")))
+    if proc.returncode != 0 or "paint" not in marks:
+        why = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        print(f"  (skipping first paint: {why})", file=sys.stderr)
+        return None
+    return {k: float(v) - t0 for k, v in marks.items()}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--budget-ms", type=float, default=600.0,
+                    help="fail when the median import of the main window takes longer")
+    args = ap.parse_args()
+
+    samples = [import_sample() for _ in range(args.repeat)]
+    import_s = statistics.median(s for s, _ in samples)
+    loaded = sorted({m for _, mods in samples for m in mods})
+
+    print("main window cold start")
+    print(f"  import app.ui.main_window  {import_s * 1000:>8.1f} ms  (median of {args.repeat})")
+
+    if os.getenv("BENCH_DATABASE_URL"):
+        paints = []
+        while len(paints) < args.repeat and (sample := paint_sample()) is not None:
+            paints.append(sample)
+        if paints:
+            for mark, label in (("paint", "first paint"), ("rows", "first rows")):
+                times = [p[mark] for p in paints if mark in p]
+                if times:
+                    print(f"  {label:<26} {statistics.median(times) * 1000:>8.1f} ms")
+    else:
+        print("  (skipping first paint: BENCH_DATABASE_URL not set)", file=sys.stderr)
+
+    failed = False
+    if loaded:
+        print(f"❌ loaded at startup, should load on first use: {', '.join(loaded)}")
+        failed = True
+    if import_s * 1000 > args.budget_ms:
+        print(f"❌ import over budget: {import_s * 1000:.1f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/bench_statements.py
+"""
+Per-call overhead of get_transactions and get_first_page (as the main
+window's refresh calls it) for the 64 filter combinations: the statement
+rebuilt from transaction_filters on every call (as it used to be) vs the
+cached statement per filter combination (app.db.transactions_stmt,
+first_page_stmt).
+
+- build: Python time to produce the statement and its cache key, which is
+  what SQLAlchemy computes before looking up the compiled SQL (no database);
+- call: a whole call, over a small table so the query itself does not hide
+  the overhead.
+
+    python -m benchmarks.bench_statements [--rows 1000] [--no-seed] [--repeat 200]
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import and_, select, true
+
+from benchmarks.synthetic import bench_engine, filter_combinations, sample_filters, seed
+from app.balances import balance_on_expr
+from app.db import (LIST_COLUMNS, PAGE_SIZE, SEARCH_LIMIT, SessionLocal, first_page_stmt, get_first_page,
+                    get_transactions, notes_rank, projection_select, sum_by_type, transaction_filters,
+                    transactions_stmt)
+from app.models import Transaction
+
+
+# ---------- the statements as they were built before the cache ----------
+def dynamic_transactions_stmt(**filters):
+    stmt = select(Transaction)
+    where = transaction_filters(**filters)
+    if where:
+        stmt = stmt.where(and_(*where))
+    return stmt.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+
+def dynamic_first_page_stmt(limit=PAGE_SIZE, ranked=False, columns=LIST_COLUMNS, balance=False, **filters):
+    where = transaction_filters(**filters)
+    totals = select(sum_by_type("income").label("income"), sum_by_type("expense").label("expense"))
+    if balance and filters.get("account_id") is not None:
+        totals = totals.add_columns(balance_on_expr(filters["account_id"], filters.get("date_to")).label("balance"))
+    page = projection_select(columns)
+    order = [Transaction.date.desc(), Transaction.id.desc()]
+    if ranked and filters.get("notes_query"):
+        rank = notes_rank(filters["notes_query"]).label("rank")
+        page = page.add_columns(rank)
+        order.insert(0, rank.desc())
+    if where:
+        totals = totals.where(and_(*where))
+        page = page.where(and_(*where))
+    totals = totals.subquery("totals")
+    page = page.order_by(*order).limit(limit).subquery("page")
+    outer_order = [page.c.date.desc(), page.c.id.desc()]
+    if "rank" in page.c:
+        outer_order.insert(0, page.c.rank.desc())
+    return select(page, *totals.c).select_from(totals).outerjoin(page, true()).order_by(*outer_order)
+
+
+def refresh_args(filters: dict) -> dict:
+    """The get_first_page arguments main_window.refresh_table passes."""
+    ranked = bool(filters.get("notes_query"))
+    ledger = "account_id" in filters and not any(filters.get(k) for k in ("tx_type", "category_id", "notes_query"))
+    return {**filters, "limit": SEARCH_LIMIT if ranked else PAGE_SIZE + 1, "ranked": ranked, "balance": ledger}
+
+
+def dynamic_get_transactions(session, **filters):
+    return session.execute(dynamic_transactions_stmt(**filters)).scalars().all()
+
+
+def dynamic_get_first_page(session, **args):
+    result = session.execute(dynamic_first_page_stmt(**args)).all()
+    return [r for r in result if r.id is not None], result[0].income, result[0].expense
+
+
+# ---------- cases: (build before, build after, call before, call after) ----------
+def cases(session):
+    def build(make):
+        return lambda **f: make(**f)._generate_cache_key()
+
+    def build_cached(make):
+        return lambda **f: make(**f)[0]._generate_cache_key()
+
+    return {
+        "get_transactions": (
+            build(dynamic_transactions_stmt), build_cached(transactions_stmt),
+            lambda **f: dynamic_get_transactions(session, **f), lambda **f: get_transactions(session, **f),
+        ),
+        "get_first_page": (
+            lambda **f: build(dynamic_first_page_stmt)(**refresh_args(f)),
+            lambda **f: build_cached(first_page_stmt)(**refresh_args(f)),
+            lambda **f: dynamic_get_first_page(session, **refresh_args(f)),
+            lambda **f: get_first_page(session, **refresh_args(f)),
+        ),
+    }
+
+
+def per_call_us(fn, combos: list[dict], repeat: int) -> list[float]:
+    """Median microseconds per fn(**filters), one value per combination."""
+    results = []
+    for filters in combos:
+        fn(**filters)  # warm: compiled cache, statement cache
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(**filters)
+            times.append(time.perf_counter() - t0)
+        results.append(statistics.median(times) * 1e6)
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000)
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--no-seed", action="store_true", help="reuse the current table contents")
+    args = ap.parse_args()
+
+    engine = bench_engine()
+    if not args.no_seed:
+        seed(engine, args.rows)
+    with engine.connect() as conn:
+        values = sample_filters(conn)
+    combos = [{k: values[k] for k in combo} for combo in filter_combinations()]
+
+    with SessionLocal() as s:
+        for filters in combos:
+            before = [tx.id for tx in dynamic_get_transactions(s, **filters)]
+            assert before == [tx.id for tx in get_transactions(s, **filters)], f"results differ: {filters}"
+            rows, inc, exp = dynamic_get_first_page(s, **refresh_args(filters))
+            assert (rows, inc, exp) == get_first_page(s, **refresh_args(filters)), f"first page differs: {filters}"
+
+        print(f"per-call overhead, {len(combos)} filter combinations"
+              + ("" if args.no_seed else f", {args.rows:,} rows"))
+        print(f"  {'':<24} {'dynamic':>10} {'cached':>10} {'saved':>10}   (µs, mean of per-combination medians)")
+        for name, (build_before, build_after, call_before, call_after) in cases(s).items():
+            for label, before, after in (("build", build_before, build_after), ("call", call_before, call_after)):
+                d = statistics.mean(per_call_us(before, combos, args.repeat))
+                c = statistics.mean(per_call_us(after, combos, args.repeat))
+                print(f"  {name + ' ' + label:<24} {d:>10.1f} {c:>10.1f} {d - c:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# benchmarks/run.py
+"""
+Benchmark suite for the data access and UI hot paths.
+
+For every table size, seeds BENCH_DATABASE_URL with deterministic synthetic
+data and times:
+- get_transactions for each of the 64 filter combinations;
+- get_first_page (what a refresh issues) for each combination;
+- the dashboard's _load_aggregates;
+- the main window's filtered_rows;
+- a full CSV export (write_csv) and, with pyarrow installed, Parquet export;
+- Treeview population in a hidden Tk root (skipped without a display).
+
+Results are written as JSON; --compare reports cases that got slower than a
+previous results file and exits non-zero if any did.
+
+    python -m benchmarks.run --sizes 10000 100000 --out bench.json
+    python -m benchmarks.run --sizes 10000 100000 --compare bench.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import sqlalchemy
+
+from benchmarks.synthetic import bench_engine, seed, sample_filters, filter_combinations
+from app.db import SessionLocal, get_transactions, get_transactions_page, get_first_page
+from app.export import write_csv, write_columnar
+from app.ui.dashboard_window import _load_aggregates
+from app.ui.main_window import filtered_rows
+
+
+class Field:
+    """Stands in for the filter Combobox/Entry widgets filtered_rows reads."""
+
+    def __init__(self, value=""):
+        self.value = "" if value is None else str(value)
+
+    def get(self):
+        return self.value
+
+
+def timed(fn, repeat: int) -> dict:
+    """Run fn `repeat` times; min/median/max wall time in seconds."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"min": min(times), "median": statistics.median(times), "max": max(times), "repeat": repeat}
+
+
+def combo_label(combo) -> str:
+    return "+".join(combo) or "none"
+
+
+def query_cases(values: dict, unbounded: bool):
+    """(name, fn) for the per-filter-combination query cases."""
+    for combo in filter_combinations():
+        filters = {k: values[k] for k in combo}
+        label = combo_label(combo)
+        if unbounded:
+            def full(filters=filters):
+                with SessionLocal() as s:
+                    get_transactions(s, **filters)
+            yield f"get_transactions[{label}]", full
+
+        def first(filters=filters):
+            with SessionLocal() as s:
+                get_first_page(s, **filters)
+        yield f"get_first_page[{label}]", first
+
+
+def screen_cases(values: dict, date_from: date, date_to: date):
+    yield "load_aggregates", lambda: _load_aggregates(date_from, date_to)
+
+    widgets = dict(
+        cb_type=Field(values["tx_type"]),
+        cb_cat=Field(),
+        cb_acc=Field(),
+        ent_from=Field(values["date_from"]),
+        ent_to=Field(values["date_to"]),
+        ent_search=Field(),
+    )
+    yield "filtered_rows", lambda: filtered_rows(**widgets)
+
+    def export():
+        with tempfile.TemporaryDirectory() as tmp, SessionLocal() as s:
+            write_csv(s, os.path.join(tmp, "bench.csv"), {})
+    yield "export_csv", export
+
+    if importlib.util.find_spec("pyarrow") is not None:
+        def export_parquet():
+            with tempfile.TemporaryDirectory() as tmp, SessionLocal() as s:
+                write_columnar(s, os.path.join(tmp, "bench.parquet"), {})
+        yield "export_parquet", export_parquet
+
+
+def tree_cases(tree_rows: int):
+    """Treeview population; yields nothing when Tk has no display."""
+    import tkinter as tk
+    from tkinter import ttk
+    from app.ui.jobs import JobRunner
+    from app.ui.transaction_table import TransactionTable
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        print(f"  (skipping Treeview cases: {exc})", file=sys.stderr)
+        return
+    root.withdraw()
+    cols = ("ID", "Date", "Type", "Amount", "Account", "Category", "Notes")
+    tree = ttk.Treeview(root, columns=cols, show="headings")
+    sb = ttk.Scrollbar(root, orient="vertical", command=tree.yview)
+    jobs = JobRunner(root)
+    table = TransactionTable(tree, sb, jobs)
+    try:
+        with SessionLocal() as s:
+            page, _, _ = get_first_page(s, limit=table.page_size + 1)
+            rows = get_transactions_page(s, limit=tree_rows)
+
+        def populate(rows, paged):
+            table.load({}, rows, paged=paged)
+            root.update_idletasks()
+
+        yield "treeview_first_page", lambda: populate(page, True)
+        yield f"treeview_{len(rows)}_rows", lambda: populate(rows, False)
+    finally:
+        jobs.shutdown()
+        root.destroy()
+
+
+def run_size(engine, rows: int, args) -> dict:
+    end = date.today()
+    if not args.no_seed:
+        print(f"seeding {rows} rows…", file=sys.stderr)
+        seed(engine, rows, days=args.days, end=end)
+    with engine.connect() as conn:
+        values = sample_filters(conn, end)
+
+    cases = list(query_cases(values, unbounded=rows <= args.max_unbounded))
+    cases += screen_cases(values, values["date_from"], end)
+    if not args.no_tk:
+        cases += tree_cases(args.tree_rows)
+
+    results = {}
+    for name, fn in cases:
+        fn()  # warm-up: connection pool, statement cache, refdata
+        results[name] = timed(fn, args.repeat)
+        print(f"{rows:>10} {name:<80} {results[name]['median'] * 1000:>10.2f} ms", file=sys.stderr)
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta: float) -> int:
+    """
+    Print median ratios vs `baseline`; returns the number of regressions.
+    A case regresses when it is slower by more than `tolerance` (relative)
+    and by more than `min_delta` seconds, so sub-millisecond jitter is ignored.
+    """
+    regressions = 0
+    for size, cases in current["results"].items():
+        base_cases = baseline["results"].get(size, {})
+        for name, res in cases.items():
+            base = base_cases.get(name)
+            if base is None:
+                continue
+            ratio = res["median"] / base["median"] if base["median"] else float("inf")
+            flag = ""
+            if ratio > 1 + tolerance and res["median"] - base["median"] > min_delta:
+                regressions += 1
+                flag = "  ❌ slower"
+            elif ratio < 1 - tolerance:
+                flag = "  ✅ faster"
+            print(f"{size:>10} {name:<80} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark the data access and UI hot paths.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                    help="table sizes to seed, 10k to 10M")
+    ap.add_argument("--days", type=int, default=365, help="date range the rows are spread over")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--max-unbounded", type=int, default=1_000_000,
+                    help="skip the unbounded get_transactions cases above this size")
+    ap.add_argument("--tree-rows", type=int, default=10_000,
+                    help="rows loaded into the Treeview for the full-population case")
+    ap.add_argument("--no-tk", action="store_true", help="skip the Treeview cases")
+    ap.add_argument("--no-seed", action="store_true",
+                    help="reuse the current table contents (only with a single size)")
+    ap.add_argument("--out", help="write results to this JSON file")
+    ap.add_argument("--compare", help="baseline JSON file from an earlier run")
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="median slowdown tolerated by --compare (0.2 = 20%%)")
+    ap.add_argument("--min-delta", type=float, default=0.005,
+                    help="absolute slowdown in seconds below which --compare ignores a case")
+    args = ap.parse_args()
+    if args.no_seed and len(args.sizes) > 1:
+        ap.error("--no-seed only makes sense with a single --sizes value")
+
+    engine = bench_engine()
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "server": engine.dialect.name,
+            "repeat": args.repeat,
+            "days": args.days,
+        },
+        "results": {str(n): run_size(engine, n, args) for n in args.sizes},
+    }
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"❌ {regressions} case(s) slower than baseline by more than "
+                  f"{args.tolerance:.0%}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ No regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# benchmarks/synthetic.py
+"""
+Deterministic synthetic data for benchmarks.
+
+The same (rows, days, end) arguments always produce the same table contents:
+every column is derived from the row number with generate_series, so seeding
+1M rows is a single server-side INSERT ... SELECT.
+"""
+import os
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, text
+
+from app.balances import rebuild_checkpoints
+
+ACCOUNTS = ["Cash", "Bank Account", "Credit Card", "Savings", "Wallet"]
+
+CATEGORIES = [
+    ("Salary", "income"),
+    ("Bonus", "income"),
+    ("Investments", "income"),
+    ("Food", "expense"),
+    ("Rent", "expense"),
+    ("Transport", "expense"),
+    ("Entertainment", "expense"),
+]
+
+NOTE_WORDS = [
+    "grocery", "market", "coffee", "uber", "train", "cinema", "netflix",
+    "salary", "bonus", "dividend", "rent", "electricity", "pharmacy", "gym",
+]
+
+
+def bench_engine():
+    """Engine for BENCH_DATABASE_URL; refuses to run against anything else."""
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        raise SystemExit(
+            "BENCH_DATABASE_URL not set. Benchmarks truncate the transactions "
+            "table, point them at a scratch database."
+        )
+    return create_engine(url, future=True)
+
+
+def seed_reference_data(conn) -> tuple[list[int], list[str], list[int]]:
+    """Make sure accounts/categories exist; return (cat_ids, cat_types, acc_ids)."""
+    for name in ACCOUNTS:
+        conn.execute(
+            text("INSERT INTO accounts (name) VALUES (:name) ON CONFLICT (name) DO NOTHING"),
+            {"name": name},
+        )
+    for name, type_ in CATEGORIES:
+        conn.execute(
+            text(
+                "INSERT INTO categories (name, type) VALUES (:name, :type) "
+                "ON CONFLICT (name) DO NOTHING"
+            ),
+            {"name": name, "type": type_},
+        )
+    cats = conn.execute(text("SELECT id, type FROM categories ORDER BY id")).all()
+    accs = conn.execute(text("SELECT id FROM accounts ORDER BY id")).scalars().all()
+    return [c[0] for c in cats], [c[1] for c in cats], list(accs)
+
+
+def seed(engine, rows: int, days: int = 365, end: date | None = None,
+         batch: int = 1_000_000) -> None:
+    """
+    Replace the contents of `transactions` with `rows` synthetic rows spread
+    evenly over the `days` days ending at `end` (default: today).
+    """
+    end = end or date.today()
+    with engine.begin() as conn:
+        cat_ids, cat_types, acc_ids = seed_reference_data(conn)
+        conn.execute(text("TRUNCATE transactions RESTART IDENTITY"))
+        conn.execute(
+            text("SELECT ensure_transaction_partitions(CAST(:end AS date) - :days, CAST(:end AS date))"),
+            {"end": end, "days": days},
+        )
+        for lo in range(1, rows + 1, batch):
+            hi = min(lo + batch - 1, rows)
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO transactions (date, amount, type, category_id, account_id, notes)
+                    SELECT CAST(:end AS date) - CAST(g % :days AS int),
+                           ((g * 7919) % 50000 + 100) / 100.0,
+                           (CAST(:cat_types AS text[]))[1 + g % :ncat],
+                           (CAST(:cat_ids AS int[]))[1 + g % :ncat],
+                           (CAST(:acc_ids AS int[]))[1 + (g / 7) % :nacc],
+                           (CAST(:words AS text[]))[1 + (g * 31) % :nwords]
+                             || ' ' || (CAST(:words AS text[]))[1 + (g * 17) % :nwords]
+                             || ' #' || g
+                    FROM generate_series(CAST(:lo AS bigint), CAST(:hi AS bigint)) AS g
+                    """
+                ),
+                {
+                    "end": end,
+                    "days": days,
+                    "cat_types": cat_types,
+                    "cat_ids": cat_ids,
+                    "ncat": len(cat_ids),
+                    "acc_ids": acc_ids,
+                    "nacc": len(acc_ids),
+                    "words": NOTE_WORDS,
+                    "nwords": len(NOTE_WORDS),
+                    "lo": lo,
+                    "hi": hi,
+                },
+            )
+        rebuild_checkpoints(conn)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE transactions"))
+
+
+FILTERS = ["tx_type", "category_id", "account_id", "date_from", "date_to", "notes_query"]
+
+
+def sample_filters(conn, end: date | None = None) -> dict:
+    """One representative value per filter of get_transactions, for seeded data."""
+    end = end or date.today()
+    cat_id = conn.execute(text("SELECT id FROM categories WHERE type = 'expense' ORDER BY id")).scalar()
+    acc_id = conn.execute(text("SELECT id FROM accounts ORDER BY id")).scalar()
+    return {
+        "tx_type": "expense",
+        "category_id": cat_id,
+        "account_id": acc_id,
+        "date_from": end - timedelta(days=90),
+        "date_to": end - timedelta(days=30),
+        "notes_query": "coffee",
+    }
+
+
+def filter_combinations():
+    """All 64 subsets of FILTERS, smallest first."""
+    from itertools import combinations
+    for n in range(len(FILTERS) + 1):
+        yield from combinations(FILTERS, n)
@@ -0,0 +1,58 @@
+"""
+Check that the streaming CSV export keeps a flat memory profile.
+
+Exports synthetic tables of increasing size (BENCH_DATABASE_URL) and fails
+if the Python heap peak of the largest export exceeds that of a reference
+export a few chunks long: the peak is set by the chunk size, not the rows.
+
+    BENCH_DATABASE_URL=... python scripts/check_export_memory.py [--large 10000000]
+"""
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic import bench_engine, seed
+from app.db import SessionLocal
+from app.export import write_csv, CHUNK_SIZE
+
+
+def export_peak(rows: int) -> int:
+    """Peak traced Python memory (bytes) while exporting `rows` rows."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        try:
+            with SessionLocal() as s:
+                n = write_csv(s, os.path.join(tmp, "out.csv"), {})
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    assert n == rows, f"exported {n} rows, expected {rows}"
+    return peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--large", type=int, default=1_000_000)
+    ap.add_argument("--max-ratio", type=float, default=1.5)
+    args = ap.parse_args()
+
+    engine = bench_engine()
+    reference = 4 * CHUNK_SIZE
+    peaks = {}
+    for rows in (1_000, reference, args.large):
+        seed(engine, rows, days=3650)
+        peaks[rows] = export_peak(rows)
+        print(f"{rows:>10} rows: peak {peaks[rows] / 1024:,.0f} KiB")
+
+    ratio = peaks[args.large] / peaks[reference]
+    print(f"ratio: {ratio:.2f} (max {args.max_ratio})")
+    if ratio > args.max_ratio:
+        raise SystemExit("❌ export memory grows with row count")
+    print("✅ export memory is flat")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+EXPLAIN every get_transactions filter combination and fail on a seq scan.
+
+Seeds a synthetic table (BENCH_DATABASE_URL, default 1M rows), then, for each
+of the 64 combinations of type / category / account / date_from / date_to /
+notes, runs EXPLAIN on the two statements the main window issues:
+- refresh: get_first_page as refresh_table calls it (the page LEFT JOINed to
+  the totals; ranked by full-text match with search text; with the account
+  balance for a single account and nothing but dates);
+- next page: the keyset page of get_transactions_page.
+Reading `transactions` (or one of its monthly partitions that holds rows)
+with a Seq Scan is a regression in the page and in the balance lookup, which
+are under a LIMIT. The totals aggregate of refresh sums every matching row
+and may scan. Empty partitions, such as the upcoming months, are free to scan.
+
+    BENCH_DATABASE_URL=... python scripts/check_query_plans.py [--rows 1000000] [--no-seed]
+"""
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+from datetime import date
+
+from sqlalchemy import text
+
+from benchmarks.synthetic import bench_engine, seed, sample_filters, filter_combinations
+from app.db import first_page_stmt, transactions_page_stmt, PAGE_SIZE, SEARCH_LIMIT
+
+
+def scans(plan: dict, limited: bool = False) -> list[tuple[str, str, bool]]:
+    """
+    (node type, index or relation name, under a Limit) of every scan node in
+    the plan tree.
+    """
+    limited = limited or plan["Node Type"] == "Limit"
+    found = []
+    if plan["Node Type"].endswith("Scan"):
+        found.append((plan["Node Type"], plan.get("Index Name") or plan.get("Relation Name", "?"), limited))
+    for child in plan.get("Plans", []):
+        found.extend(scans(child, limited))
+    return found
+
+
+def explain(conn, stmt, params: dict) -> dict:
+    compiled = stmt.compile(dialect=conn.dialect)
+    return conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.construct_params(params)
+    ).scalar()[0]["Plan"]
+
+
+def refresh_stmt(filters: dict):
+    """get_first_page's (statement, params) with the arguments refresh_table passes."""
+    ranked = bool(filters.get("notes_query"))
+    ledger = "account_id" in filters and not any(
+        filters.get(k) for k in ("tx_type", "category_id", "notes_query")
+    )
+    limit = SEARCH_LIMIT if ranked else PAGE_SIZE + 1
+    return first_page_stmt(**filters, limit=limit, ranked=ranked, balance=ledger)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--no-seed", action="store_true", help="reuse the current table contents")
+    args = ap.parse_args()
+
+    engine = bench_engine()
+    end = date.today()
+    if not args.no_seed:
+        seed(engine, args.rows, days=3650, end=end)
+
+    failures = 0
+    with engine.connect() as conn:
+        values = sample_filters(conn, end)
+        # estimated rows per table (partitions are analyzed by the seeder)
+        sizes = dict(conn.execute(text(
+            "SELECT relname, reltuples FROM pg_class WHERE relname LIKE 'transactions%' AND relkind = 'r'"
+        )).all())
+        for combo in filter_combinations():
+            filters = {k: values[k] for k in combo}
+            label = ", ".join(combo) or "(no filters)"
+            for kind, (stmt, params) in (
+                ("refresh", refresh_stmt(filters)),
+                ("next page", transactions_page_stmt(**filters, limit=PAGE_SIZE + 1)),
+            ):
+                used = scans(explain(conn, stmt, params))
+                bad = [
+                    name for node, name, limited in used
+                    if node == "Seq Scan" and limited
+                    and name.startswith("transactions") and sizes.get(name, 1) > 0
+                ]
+                if bad:
+                    failures += 1
+                    print(f"❌ {label} [{kind}]: Seq Scan on {', '.join(bad)}")
+                else:
+                    print(f"✅ {label} [{kind}]: " + ", ".join(
+                        f"{node} {name}" for node, name, limited in used if limited
+                    ))
+
+    if failures:
+        raise SystemExit(f"{failures} statements regressed to a seq scan")
+
+
+if __name__ == "__main__":
+    main()
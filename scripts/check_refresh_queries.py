@@ -0,0 +1,79 @@
+"""
+Count the statements one main-window refresh sends to the database.
+
+The first refresh also loads the reference-data cache; every refresh after
+that must need exactly one statement (first page + totals), whatever the
+filters. Runs against DATABASE_URL and does not modify anything.
+
+    python scripts/check_refresh_queries.py
+"""
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import event
+
+from app.db import engine, PAGE_SIZE
+from app.refdata import refdata
+from app.ui.main_window import refresh_table
+
+
+class Field:
+    """Stands in for an Entry/Combobox: only .get() is used by refresh_table."""
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class Jobs:
+    """Stands in for JobRunner: runs the job inline and delivers the result."""
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None, **kwargs):
+        result = fn(*args, **kwargs)
+        if on_done is not None:
+            on_done(result)
+
+
+class Table:
+    """Stands in for TransactionTable: records what refresh_table hands over."""
+    page_size = PAGE_SIZE
+    jobs = Jobs()
+
+    def load(self, filters, rows, paged=True, totals=None, ledger=False):
+        self.filters, self.rows = filters, rows
+
+
+def main():
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *a: statements.append(stmt))
+
+    category = next(iter(refdata.category_names().values()), "")
+    account = next(iter(refdata.account_names().values()), "")
+    refdata.invalidate()
+
+    scenarios = [
+        ("no filters", {}),
+        ("type", {"cb_type": Field("expense")}),
+        ("category + account", {"cb_cat": Field(category), "cb_acc": Field(account)}),
+        ("account ledger", {"cb_acc": Field(account), "ent_to": Field("2030-12-31")}),
+        ("dates + search", {"ent_from": Field("2020-01-01"), "ent_to": Field("2030-12-31"),
+                            "ent_search": Field("rent")}),
+    ]
+
+    failures = 0
+    for round_ in ("cold", "warm"):
+        for label, widgets in scenarios:
+            statements.clear()
+            refresh_table(Table(), **widgets)
+            n = len(statements)
+            ok = round_ == "cold" or n == 1
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} {round_:>4} {label}: {n} statement(s)")
+
+    if failures:
+        raise SystemExit(f"{failures} warm refreshes needed more than one statement")
+
+
+if __name__ == "__main__":
+    main()